@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""Hashtag matching throughput: compiled rule engine vs the old if-chains.
+
+Builds synthetic stories (title + beats), checks both implementations agree,
+then times each over the whole set. `--extra-rules N` appends N synthetic
+keyword rules (pushing the engine onto its regex path) and compares against
+a naive per-rule loop instead:
+
+    python scripts/bench_hashtags.py --stories 5000 --beats 9
+    python scripts/bench_hashtags.py --extra-rules 200
+    ECHO_HASHTAG_RULES=my_rules.json python scripts/bench_hashtags.py
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+from echo_os.utils.hashtags import DEFAULT_RULES, HashtagRules, load_rules  # noqa: E402
+
+WORDS = (
+    "neon data neural virtual digital awakening rain glass river market signal "
+    "ghost temple circuit mirror dawn echo"
+).split()
+TITLES = ("Cyberpunk Dreams", "Gölge Protokolü", "Neon Tide", "Glass River", "Mühür")
+
+
+def legacy_hashtags(meta, story_beats):
+    """The pre-rules implementation, kept verbatim for comparison"""
+    hashtags = set(meta.get("hashtags", []))
+    story_title = meta.get("story", "").lower()
+    if "cyberpunk" in story_title:
+        hashtags.update(["#Cyberpunk", "#Neon", "#Futuristic", "#TechNoir"])
+    if "dreams" in story_title:
+        hashtags.update(["#DigitalDreams", "#VirtualReality", "#AIDreams"])
+    if "gölge" in story_title or "protokol" in story_title:
+        hashtags.update(["#GölgeProtokolü", "#DigitalSpirituality", "#CodeAsFaith"])
+    for beat in story_beats:
+        if "neon" in beat.lower():
+            hashtags.add("#NeonAesthetic")
+        if "data" in beat.lower():
+            hashtags.add("#DataArt")
+        if "neural" in beat.lower():
+            hashtags.add("#NeuralInterface")
+        if "virtual" in beat.lower():
+            hashtags.add("#VirtualReality")
+        if "digital" in beat.lower():
+            hashtags.add("#DigitalArt")
+        if "awakening" in beat.lower():
+            hashtags.add("#DigitalAwakening")
+    hashtags.update(
+        ["#ECHOOS", "#VisualStory", "#Cinematic", "#AIArt", "#DigitalStorytelling",
+         "#CyberpunkArt", "#NeonAesthetic"]
+    )
+    return sorted(hashtags)
+
+
+def naive_rules(data):
+    """Data-driven but uncompiled: every rule re-lowercases every beat"""
+
+    def hashtags(meta, story_beats):
+        tags = set(meta.get("hashtags", []))
+        title = meta.get("story", "").lower()
+        for rule in data["rules"]:
+            texts = [title] if rule["in"] == "title" else story_beats
+            if any(kw in t.lower() for kw in rule["match"] for t in texts):
+                tags.update(rule["tags"])
+        tags.update(data["always"])
+        return sorted(tags)
+
+    return hashtags
+
+
+def make_stories(n: int, beats: int, seed: int = 7):
+    rnd = random.Random(seed)
+    return [
+        (
+            {"story": f"{rnd.choice(TITLES)} {i}", "hashtags": ["#ECHOOS"]},
+            [" ".join(rnd.sample(WORDS, 3)).title() for _ in range(beats)],
+        )
+        for i in range(n)
+    ]
+
+
+def _time(fn, stories, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for meta, beats in stories:
+            fn(meta, beats)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--stories", type=int, default=5000)
+    ap.add_argument("--beats", type=int, default=9)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--extra-rules", type=int, default=0)
+    args = ap.parse_args()
+
+    stories = make_stories(args.stories, args.beats)
+
+    if args.extra_rules:
+        with open(DEFAULT_RULES, encoding="utf-8") as f:
+            data = json.load(f)
+        data["rules"] += [
+            {"in": "beats", "match": [f"{w}{i}"], "tags": [f"#Tag{i}"]}
+            for i, w in zip(range(args.extra_rules), WORDS * args.extra_rules)
+        ]
+        baseline = ("naive rules loop", naive_rules(data))
+        compiled = HashtagRules.compile(data).hashtags
+    else:
+        baseline = ("legacy if-chains", legacy_hashtags)
+        compiled = load_rules().hashtags
+
+    if args.extra_rules or not os.getenv("ECHO_HASHTAG_RULES"):
+        mismatches = sum(baseline[1](m, b) != compiled(m, b) for m, b in stories)
+        print(f"equivalence check: {mismatches} mismatches")
+
+    for name, fn in (baseline, ("compiled rules", compiled)):
+        t = _time(fn, stories, args.repeat)
+        print(f"{name:>17}: {args.stories / t:>10,.0f} stories/s  ({t * 1000:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Render pool throughput vs number of ComfyUI nodes.
+
+Spins up N in-process fake ComfyUI servers, each rendering one job at a time
+in `--job-ms`, and times a batch of scenes through the "comfy-pool" adapter.
+With least-outstanding dispatch the wall time should drop ~linearly with N:
+
+    python scripts/bench_render_pool.py --nodes 1 2 4 8 --scenes 32
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Response  # noqa: E402
+from echo_os.adapters.render.comfyui import ComfyUIRenderAdapter  # noqa: E402
+from echo_os.adapters.render.pool import RenderPoolAdapter  # noqa: E402
+
+
+def fake_node(job_seconds: float) -> httpx.ASGITransport:
+    app, gpu, jobs = FastAPI(), asyncio.Lock(), {}
+
+    @app.get("/system_stats")
+    async def system_stats():
+        return {}
+
+    @app.post("/prompt")
+    async def prompt(body: dict):
+        pid = f"p{len(jobs)}"
+        saves = [k for k, n in body["prompt"].items() if n["class_type"] == "SaveImage"]
+
+        async def run():
+            async with gpu:  # one job at a time, like a single GPU
+                await asyncio.sleep(job_seconds)
+            return saves
+
+        jobs[pid] = asyncio.ensure_future(run())
+        return {"prompt_id": pid, "node_errors": {}}
+
+    @app.get("/history/{pid}")
+    async def history(pid: str):
+        if not jobs[pid].done():
+            return {}
+        outputs = {k: {"images": [{"filename": f"{pid}.png"}]} for k in jobs[pid].result()}
+        return {pid: {"outputs": outputs, "status": {"completed": True}}}
+
+    @app.get("/view")
+    async def view(filename: str):
+        return Response(b"\x89PNG" + filename.encode(), media_type="image/png")
+
+    return httpx.ASGITransport(app=app)
+
+
+async def bench(nodes: int, scenes: int, job_seconds: float, out: Path) -> float:
+    backends = [
+        ComfyUIRenderAdapter(f"http://node{i}", transport=fake_node(job_seconds), websocket=False)
+        for i in range(nodes)
+    ]
+    pool = RenderPoolAdapter(backends)
+    targets = [out / f"{nodes}_{i}.png" for i in range(scenes)]
+    started = time.perf_counter()
+    await pool.render_many(
+        "bench", [f"scene {i}" for i in range(scenes)], targets=targets, register=False
+    )
+    return time.perf_counter() - started
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nodes", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--scenes", type=int, default=24)
+    ap.add_argument("--job-ms", type=float, default=100)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = None
+        for n in args.nodes:
+            secs = asyncio.run(bench(n, args.scenes, args.job_ms / 1000, Path(tmp)))
+            base = base or secs * n
+            print(
+                f"{n:>3} nodes: {secs:6.2f}s  {args.scenes / secs:6.1f} scenes/s  "
+                f"speedup vs 1 node ×{base / secs:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Write-throughput benchmark for POST /api/log and POST /api/task.
+
+Runs the ASGI app in-process against a throwaway SQLite file and fires
+concurrent writes, so storage profiles can be compared side by side:
+
+    python scripts/bench_store.py --requests 2000 --concurrency 32
+    ECHO_DB_JOURNAL_MODE=DELETE ECHO_DB_SYNCHRONOUS=FULL python scripts/bench_store.py
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault("ECHO_DB", os.path.join(tempfile.mkdtemp(), "bench.db"))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+import httpx  # noqa: E402
+from echo_os.app import create_app  # noqa: E402
+from echo_os.config import settings  # noqa: E402
+from echo_os.store import init_db  # noqa: E402
+
+
+async def _fire(client: httpx.AsyncClient, n: int, concurrency: int, make) -> tuple[float, int]:
+    sem = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with sem:
+            url, body = make(i)
+            r = await client.post(url, json=body)
+            if r.status_code != 200:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    return time.perf_counter() - t0, errors
+
+
+async def main(n: int, concurrency: int) -> None:
+    await init_db()
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        r = await client.post("/api/project", json={"name": "bench"})
+        project_id = r.json()["id"]
+
+        cases = {
+            "/api/log": lambda i: (
+                "/api/log",
+                {"code": f"BENCH/{i:06d}", "title": f"bench {i}", "content": "x" * 256},
+            ),
+            "/api/task": lambda i: (
+                "/api/task",
+                {"project_id": project_id, "title": f"task {i}", "description": "y" * 128},
+            ),
+        }
+        print(
+            f"db={settings.db_path} journal={settings.db_journal_mode} "
+            f"sync={settings.db_synchronous} readers={settings.db_read_pool_size}"
+        )
+        for name, make in cases.items():
+            elapsed, errors = await _fire(client, n, concurrency, make)
+            print(f"{name:10s} {n / elapsed:9.1f} req/s  ({n} reqs, {errors} errors)")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--requests", type=int, default=1000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    args = ap.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -3,17 +3,21 @@
 from __future__ import annotations
 import time
 from pathlib import Path
+from typing import Optional
 from openai import OpenAI
-from ...artifacts.storage import artifact_path, write_meta
+from ...artifacts.storage import atomic_write_bytes, resolve_output, write_meta
+from ...artifacts.registry import register_artifact
 
 
-async def tts_generate(project: str, text: str, voice: str = "alloy") -> Path:
+async def tts_generate(
+    project: str, text: str, voice: str = "alloy", target: Optional[Path] = None
+) -> Path:
     """Generate speech from text using OpenAI TTS"""
+    started = time.perf_counter()
     client = OpenAI()
 
-    # Create artifact directory
-    out = artifact_path(project, "openai-tts", seed=str(time.time()))
-    audio_path = out / "voice.mp3"
+    # Resolve output location (caller's target, or a fresh artifact directory)
+    audio_path, meta_dir = resolve_output(project, "openai-tts", "voice.mp3", target)
 
     # Generate speech
     response = client.audio.speech.create(
@@ -21,7 +25,7 @@ async def tts_generate(project: str, text: str, voice: str = "alloy") -> Path:
     )
 
     # Save audio file
-    audio_path.write_bytes(response.content)
+    atomic_write_bytes(audio_path, response.content)
 
     # Write metadata
     meta = {
@@ -29,7 +33,17 @@ async def tts_generate(project: str, text: str, voice: str = "alloy") -> Path:
         "voice": voice,
         "text": text,
         "model": "gpt-4o-mini-tts",
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
     }
-    write_meta(out, meta)
+    if meta_dir:
+        write_meta(meta_dir, meta)
+    register_artifact(
+        audio_path,
+        adapter="openai-tts",
+        project=project,
+        prompt=text,
+        duration_ms=meta["duration_ms"],
+        voice=voice,
+    )
 
     return audio_path
@@ -1,9 +1,12 @@
 """Base Render Adapter — Abstract interface for visual generation"""
 
 from __future__ import annotations
-from dataclasses import dataclass
+import asyncio
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Mapping
+from typing import List, Mapping, Optional, Sequence, Tuple, Union
+from ...artifacts.registry import register_artifact
 
 
 @dataclass
@@ -12,9 +15,84 @@ class RenderResult:
     meta: Mapping
 
 
+@dataclass(frozen=True)
+class Capabilities:
+    """What an adapter can do, for routing and sizing work"""
+
+    media: str = "image"  # kind of file written
+    sizes: Tuple[str, ...] = ()  # WxH the backend accepts; empty = any / workflow-defined
+    batch: bool = False  # render_many() is native (one request for many prompts)
+    max_concurrency: int = 1  # renders worth keeping in flight at once
+    needs_gpu: bool = False
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
 class BaseRenderAdapter:
     name = "base"
+    capabilities = Capabilities()
 
     async def render(self, project: str, prompt: str, **kwargs) -> RenderResult:
-        """Generate visual from prompt"""
+        """Generate visual from prompt.
+
+        Common kwargs: `target` — final file path (adapter keeps its own
+        extension) or directory to write into, atomically; `register` — set to
+        False to skip the artifact registry. Adapters that hash while writing
+        put the hex digest in `meta["sha256"]`.
+        """
         raise NotImplementedError
+
+    async def render_many(
+        self,
+        project: str,
+        prompts: Sequence[str],
+        *,
+        targets: Optional[Sequence] = None,
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> List[Union[RenderResult, BaseException]]:
+        """Render several prompts; results follow `prompts` order.
+
+        `targets` gives one `target` per prompt. This fallback runs `render`
+        concurrently, at most `concurrency` (default: capabilities.max_concurrency)
+        at a time; adapters whose backend batches natively override it. With
+        `return_exceptions` a failed prompt yields its exception instead of
+        failing the whole call.
+        """
+        targets = targets or [None] * len(prompts)
+        gate = asyncio.Semaphore(concurrency or self.capabilities.max_concurrency)
+
+        async def one(prompt: str, target) -> RenderResult:
+            async with gate:
+                extra = {"target": target} if target is not None else {}
+                return await self.render(project, prompt, **kwargs, **extra)
+
+        return list(
+            await asyncio.gather(
+                *(one(p, t) for p, t in zip(prompts, targets)),
+                return_exceptions=return_exceptions,
+            )
+        )
+
+    async def is_available(self) -> bool:
+        """Cheap health probe; the registry caches the answer"""
+        return True
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    def _register(self, project: str, prompt: str, result: RenderResult, **kwargs) -> None:
+        """Record the output in the artifact registry unless the caller opts out
+        (pass register=False when the file is about to be moved elsewhere)"""
+        if kwargs.get("register", True):
+            register_artifact(
+                result.path,
+                adapter=self.name,
+                project=project,
+                prompt=prompt,
+                duration_ms=result.meta.get("duration_ms"),
+                sha256=result.meta.get("sha256") or "",
+            )
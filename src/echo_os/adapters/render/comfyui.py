@@ -1,80 +1,381 @@
-"""ComfyUI Render Adapter — Local ComfyUI integration"""
+"""ComfyUI Render Adapter — Local ComfyUI integration
+
+Workflows are API-format graphs loaded once from `comfy_workflows/*.json`
+(or COMFY_WORKFLOW_DIR) and patched per render by copying only the nodes
+whose inputs change. Several prompts go to ComfyUI as one job: the nodes that
+depend on per-prompt inputs are cloned once per prompt, the rest (checkpoint
+loader, negative prompt, latent) are shared.
+
+Completion is tracked on ComfyUI's websocket when it can be opened, else by
+polling `/history`; outputs are streamed from `/view` into the artifact dir.
+"""
 
 from __future__ import annotations
+import asyncio
+import hashlib
 import json
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
 import httpx
-from .base import BaseRenderAdapter, RenderResult
+from .base import BaseRenderAdapter, Capabilities, RenderResult
 from ...config import settings
-from ...artifacts.storage import artifact_path, write_meta
-
-# Basit bir ComfyUI iş akışı: text prompt -> image (PNG)
-# Not: Kendi Comfy workflow'unun JSON'unu burada `workflow` değişkenine koy.
-WORKFLOW = {
-    "prompt": {
-        "3": {
-            "inputs": {
-                "seed": 123,
-                "steps": 20,
-                "cfg": 6.0,
-                "sampler_name": "euler",
-                "scheduler": "normal",
-                "denoise": 1.0,
-            },
-            "class_type": "KSampler",
-        },
-        "4": {
-            "inputs": {"text": "PROMPT_HERE", "clip": "5"},
-            "class_type": "CLIPTextEncode",
-        },
-        "5": {
-            "inputs": {"ckpt_name": "SDXL.safetensors"},
-            "class_type": "CheckpointLoaderSimple",
-        },
-        "6": {
-            "inputs": {"width": 1024, "height": 1024, "batch_size": 1},
-            "class_type": "EmptyLatentImage",
-        },
-        "7": {
-            "inputs": {
-                "samples": "6",
-                "num_steps": 20,
-                "cfg": 6.0,
-                "positive": "4",
-                "negative": "",
-                "sampler_name": "euler",
-                "scheduler": "normal",
-                "denoise": 1.0,
-            },
-            "class_type": "KSampler",
-        },
-        "8": {"inputs": {"samples": "7", "vae": "5"}, "class_type": "VAEDecode"},
-        "9": {
-            "inputs": {"filename_prefix": "echo", "images": "8"},
-            "class_type": "SaveImage",
-        },
+from ...artifacts.storage import CHUNK_SIZE, awrite_chunks, resolve_output, write_meta
+
+WORKFLOW_DIR = Path(__file__).with_name("comfy_workflows")
+
+Graph = Dict[str, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class WorkflowTemplate:
+    """A ComfyUI API graph plus where each named parameter lives in it"""
+
+    name: str
+    graph: Graph  # treated as read-only; patch() copies touched nodes
+    params: Dict[str, Tuple[Tuple[str, str], ...]]  # name -> ((node_id, input), ...)
+
+    def patch(self, graph: Graph, values: Dict[str, Any]) -> Graph:
+        """Copy of `graph` with `values` applied; untouched nodes are shared"""
+        out = dict(graph)
+        for name, value in values.items():
+            for node_id, key in self.params.get(name, ()):
+                if out[node_id] is graph[node_id]:
+                    node = dict(out[node_id])
+                    node["inputs"] = dict(node["inputs"])
+                    out[node_id] = node
+                out[node_id]["inputs"][key] = value
+        return out
+
+    def outputs(self) -> List[str]:
+        return [nid for nid, node in self.graph.items() if node["class_type"] == "SaveImage"]
+
+
+def _infer_params(graph: Graph) -> Dict[str, Tuple[Tuple[str, str], ...]]:
+    """Parameter map for a raw API export (no "params" section)"""
+    params: Dict[str, List[Tuple[str, str]]] = {}
+
+    def add(name: str, node_id: str, key: str) -> None:
+        params.setdefault(name, []).append((node_id, key))
+
+    for nid, node in graph.items():
+        inputs, kind = node.get("inputs", {}), node.get("class_type")
+        if kind in ("KSampler", "KSamplerAdvanced"):
+            for name, key in (("seed", "seed"), ("seed", "noise_seed"), ("steps", "steps"),
+                              ("cfg", "cfg"), ("sampler", "sampler_name"),
+                              ("scheduler", "scheduler")):
+                if key in inputs:
+                    add(name, nid, key)
+            for name, key in (("prompt", "positive"), ("negative", "negative")):
+                link = inputs.get(key)
+                if isinstance(link, list) and graph.get(link[0], {}).get("class_type") == "CLIPTextEncode":
+                    add(name, link[0], "text")
+        elif kind == "CheckpointLoaderSimple":
+            add("ckpt", nid, "ckpt_name")
+        elif kind == "EmptyLatentImage":
+            for key in ("width", "height", "batch_size"):
+                add(key, nid, key)
+        elif kind == "SaveImage":
+            add("filename_prefix", nid, "filename_prefix")
+    return {k: tuple(dict.fromkeys(v)) for k, v in params.items()}
+
+
+@lru_cache(maxsize=32)
+def _load_template(path: str, mtime_ns: int) -> WorkflowTemplate:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if "workflow" in data:
+        graph = data["workflow"]
+        params = {k: tuple(tuple(p) for p in v) for k, v in data.get("params", {}).items()}
+    else:
+        graph = data.get("prompt", data)  # raw export, optionally wrapped like a /prompt body
+        params = _infer_params(graph)
+    if "prompt" not in params:
+        raise ValueError(f"{path}: no node for the 'prompt' parameter")
+    return WorkflowTemplate(name=Path(path).stem, graph=graph, params=params)
+
+
+def load_workflow(name: str) -> WorkflowTemplate:
+    """Template by name (user dir first, then bundled) or by path; cached per file version"""
+    candidates = [Path(name)] if name.endswith(".json") else []
+    if settings.comfy_workflow_dir:
+        candidates.append(Path(settings.comfy_workflow_dir) / f"{name}.json")
+    candidates.append(WORKFLOW_DIR / f"{name}.json")
+    for path in candidates:
+        if path.is_file():
+            return _load_template(str(path), path.stat().st_mtime_ns)
+    raise FileNotFoundError(f"ComfyUI workflow not found: {name}")
+
+
+def _consumers(graph: Graph) -> Dict[str, Set[str]]:
+    out: Dict[str, Set[str]] = {nid: set() for nid in graph}
+    for nid, node in graph.items():
+        for value in node.get("inputs", {}).values():
+            if isinstance(value, list) and len(value) == 2 and value[0] in out:
+                out[value[0]].add(nid)
+    return out
+
+
+def build_job(
+    template: WorkflowTemplate, shared: Dict[str, Any], per_prompt: List[Dict[str, Any]]
+) -> Tuple[Graph, Dict[str, int]]:
+    """One graph rendering every entry of `per_prompt`.
+
+    Returns the graph and a map from SaveImage node id to prompt index.
+    """
+    graph = template.patch(template.graph, shared)
+    if len(per_prompt) == 1:
+        graph = template.patch(graph, per_prompt[0])
+        return graph, {nid: 0 for nid in template.outputs()}
+
+    # Nodes holding a per-prompt value, and everything downstream of them,
+    # are cloned per prompt; everything else is shared
+    varying = {
+        node_id
+        for values in per_prompt
+        for name in values
+        for node_id, _ in template.params.get(name, ())
     }
-}
+    consumers, stack = _consumers(graph), list(varying)
+    while stack:
+        for nxt in consumers[stack.pop()]:
+            if nxt not in varying:
+                varying.add(nxt)
+                stack.append(nxt)
+
+    job: Graph = {nid: node for nid, node in graph.items() if nid not in varying}
+    outputs: Dict[str, int] = {}
+    for i, values in enumerate(per_prompt):
+        copy = template.patch(graph, values)
+        rename = {nid: f"{nid}_{i}" for nid in varying}
+        for nid in varying:
+            node = dict(copy[nid])
+            node["inputs"] = {
+                k: [rename[v[0]], v[1]] if isinstance(v, list) and v[0] in rename else v
+                for k, v in node["inputs"].items()
+            }
+            job[rename[nid]] = node
+            if node["class_type"] == "SaveImage":
+                outputs[rename[nid]] = i
+    return job, outputs
+
+
+def _seed_for(prompt: str) -> int:
+    # Deterministic per prompt, so re-renders reproduce and ComfyUI can cache
+    return int(hashlib.sha1(prompt.encode()).hexdigest()[:8], 16)
+
+
+class ComfyUIError(RuntimeError):
+    pass
 
 
 class ComfyUIRenderAdapter(BaseRenderAdapter):
     name = "comfyui"
+    # One GPU works through the queue; a second job keeps it busy between them
+    capabilities = Capabilities(batch=True, max_concurrency=2, needs_gpu=True)
+
+    # kwargs that are not workflow parameters
+    _RESERVED = {"register", "checksum", "workflow"}
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        websocket: Optional[bool] = None,
+    ):
+        self.base_url = (base_url or f"{settings.comfy_host}:{settings.comfy_port}").rstrip("/")
+        self.transport = transport
+        self.websocket = settings.comfy_websocket if websocket is None else websocket
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url, transport=self.transport, timeout=httpx.Timeout(60, read=120)
+        )
+
+    async def health(self, timeout: float = 2.0) -> bool:
+        """True if the server answers /system_stats"""
+        try:
+            async with self._client() as http:
+                r = await http.get("/system_stats", timeout=timeout)
+            return r.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def is_available(self) -> bool:
+        return await self.health()
 
     async def render(self, project: str, prompt: str, **kwargs) -> RenderResult:
         """Generate image using ComfyUI"""
-        wf = json.loads(json.dumps(WORKFLOW))
-        # basit replace
-        wf["prompt"]["4"]["inputs"]["text"] = prompt
-
-        base = f"{settings.comfy_host}:{settings.comfy_port}"
-        async with httpx.AsyncClient(timeout=60) as client:
-            # queue prompt
-            r = await client.post(f"{base}/prompt", json=wf)
+        target = kwargs.pop("target", None)
+        return (await self._render_job(project, [prompt], [target], **kwargs))[0]
+
+    async def render_many(
+        self,
+        project: str,
+        prompts: Sequence[str],
+        *,
+        targets: Optional[Sequence] = None,
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> List[Union[RenderResult, BaseException]]:
+        """Queue prompts as batched jobs of up to `comfy_max_batch` prompts each"""
+        targets = list(targets or [None] * len(prompts))
+        size = max(1, settings.comfy_max_batch)
+        chunks = [range(i, min(i + size, len(prompts))) for i in range(0, len(prompts), size)]
+        gate = asyncio.Semaphore(concurrency or self.capabilities.max_concurrency)
+
+        async def job(idx: range) -> List[RenderResult]:
+            async with gate:
+                return await self._render_job(
+                    project, [prompts[i] for i in idx], [targets[i] for i in idx], **kwargs
+                )
+
+        done = await asyncio.gather(*map(job, chunks), return_exceptions=return_exceptions)
+        results: List[Union[RenderResult, BaseException]] = []
+        for idx, out in zip(chunks, done):
+            results.extend([out] * len(idx) if isinstance(out, BaseException) else out)
+        return results
+
+    async def _render_job(
+        self, project: str, prompts: Sequence[str], targets: Sequence, **kwargs
+    ) -> List[RenderResult]:
+        """Render prompts as one ComfyUI job; `targets` holds one path/dir (or None) each"""
+        started = time.perf_counter()
+        template = load_workflow(kwargs.get("workflow") or settings.comfy_workflow)
+        shared = {k: v for k, v in kwargs.items() if k not in self._RESERVED and k != "seed"}
+        per_prompt = [
+            {"prompt": p, "seed": kwargs.get("seed", _seed_for(p))} for p in prompts
+        ]
+        graph, outputs = build_job(template, shared, per_prompt)
+
+        async with self._client() as http:
+            prompt_id, entry = await self._run_job(http, graph)
+            images: List[List[dict]] = [[] for _ in prompts]
+            for node_id, out in entry.get("outputs", {}).items():
+                if node_id in outputs:
+                    images[outputs[node_id]].extend(out.get("images", []))
+
+            checksum = kwargs.get("checksum", True)
+            jobs, placed = [], []
+            for i, (prompt, target) in enumerate(zip(prompts, targets)):
+                if not images[i]:
+                    raise ComfyUIError(f"job {prompt_id} produced no image for prompt {i}")
+                path, meta_dir = resolve_output(project, self.name, "image.png", target)
+                for k, image in enumerate(images[i]):
+                    dest = path if k == 0 else path.with_name(f"{path.stem}_{k}{path.suffix}")
+                    jobs.append(self._download(http, image, dest, checksum))
+                placed.append((path, meta_dir))
+            digests = await asyncio.gather(*jobs)
+
+        duration_ms = self._elapsed_ms(started)
+        results, d = [], iter(digests)
+        for i, (prompt, (path, meta_dir)) in enumerate(zip(prompts, placed)):
+            shas = [next(d) for _ in images[i]]
+            meta = {
+                "adapter": self.name,
+                "prompt": prompt,
+                "workflow": template.name,
+                "prompt_id": prompt_id,
+                "seed": per_prompt[i]["seed"],
+                "images": [img["filename"] for img in images[i]],
+                "batch": len(prompts),
+                "sha256": shas[0],
+                "duration_ms": duration_ms,
+            }
+            if meta_dir:
+                write_meta(meta_dir, meta)
+            result = RenderResult(path=path, meta=meta)
+            self._register(project, prompt, result, **kwargs)
+            results.append(result)
+        return results
+
+    async def _run_job(self, http: httpx.AsyncClient, graph: Graph) -> Tuple[str, dict]:
+        client_id = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.comfy_timeout
+        # Subscribe before queueing so a fast job cannot finish unseen
+        ws = await self._connect_ws(client_id) if self.websocket else None
+        try:
+            r = await http.post("/prompt", json={"prompt": graph, "client_id": client_id})
+            if r.status_code >= 400:
+                raise ComfyUIError(f"ComfyUI rejected the workflow: {r.text[:500]}")
+            body = r.json()
+            if body.get("node_errors"):
+                raise ComfyUIError(f"ComfyUI node errors: {body['node_errors']}")
+            prompt_id = body["prompt_id"]
+
+            if ws is not None:
+                try:
+                    await asyncio.wait_for(
+                        self._wait_ws(ws, prompt_id), deadline - time.monotonic()
+                    )
+                except ComfyUIError:
+                    raise
+                except asyncio.TimeoutError:
+                    raise ComfyUIError(f"ComfyUI job {prompt_id} timed out")
+                except Exception as e:  # socket dropped: fall back to polling
+                    print(f"⚠️  ComfyUI websocket lost ({e}); polling /history")
+            return prompt_id, await self._poll_history(http, prompt_id, deadline)
+        finally:
+            if ws is not None:
+                await ws.close()
+
+    async def _connect_ws(self, client_id: str):
+        try:
+            import websockets
+        except ImportError:
+            return None
+        url = self.base_url.replace("https://", "wss://").replace("http://", "ws://")
+        try:
+            return await websockets.connect(f"{url}/ws?clientId={client_id}", max_size=None)
+        except Exception as e:
+            print(f"⚠️  ComfyUI websocket unavailable ({e}); polling /history")
+            return None
+
+    @staticmethod
+    async def _wait_ws(ws, prompt_id: str) -> None:
+        async for raw in ws:
+            if isinstance(raw, bytes):  # latent previews
+                continue
+            msg = json.loads(raw)
+            kind, data = msg.get("type"), msg.get("data") or {}
+            if data.get("prompt_id") != prompt_id:
+                continue
+            if kind == "execution_error":
+                raise ComfyUIError(
+                    f"ComfyUI failed in node {data.get('node_id')}: {data.get('exception_message')}"
+                )
+            if kind == "execution_success" or (kind == "executing" and data.get("node") is None):
+                return
+
+    @staticmethod
+    async def _poll_history(http: httpx.AsyncClient, prompt_id: str, deadline: float) -> dict:
+        delay = 0.1
+        while True:
+            r = await http.get(f"/history/{prompt_id}")
+            r.raise_for_status()
+            entry = r.json().get(prompt_id)
+            if entry:
+                status = entry.get("status") or {}
+                if status.get("status_str") == "error":
+                    raise ComfyUIError(f"ComfyUI job {prompt_id} failed: {status.get('messages')}")
+                if status.get("completed", True) and entry.get("outputs"):
+                    return entry
+            if time.monotonic() + delay > deadline:
+                raise ComfyUIError(f"ComfyUI job {prompt_id} timed out")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+    @staticmethod
+    async def _download(http: httpx.AsyncClient, image: dict, path: Path, checksum: bool):
+        params = {
+            "filename": image["filename"],
+            "subfolder": image.get("subfolder", ""),
+            "type": image.get("type", "output"),
+        }
+        async with http.stream("GET", "/view", params=params) as r:
             r.raise_for_status()
-            # Comfy'de dosyayı out klasörüne yazar; biz artifact'e kopyalamıyoruz (şimdilik meta kaydı)
-            out = artifact_path(
-                project, self.name, seed=str(r.json().get("prompt_id", "echo"))
-            )
-            meta = {"adapter": self.name, "prompt": prompt, "workflow": "inline"}
-            write_meta(out, meta)
-            # Not: dosya kopyalama için /view veya /history API'lerine bağlanıp output path'i alabilirsin.
-            return RenderResult(path=out / "comfy.txt", meta=meta)
+            return await awrite_chunks(path, r.aiter_bytes(CHUNK_SIZE), checksum)
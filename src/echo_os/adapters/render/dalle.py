@@ -1,59 +1,21 @@
 """DALL-E Render Adapter — OpenAI DALL-E integration"""
 
 from __future__ import annotations
-import asyncio
-from typing import Dict, Any
-from .base import BaseRenderAdapter, RenderResult
-from datetime import datetime
+from typing import Any, Dict
+from .openai_image import OpenAIImageRenderAdapter
 
 
-class DALLERenderAdapter(BaseRenderAdapter):
-    """DALL-E 3 API adapter"""
+class DALLERenderAdapter(OpenAIImageRenderAdapter):
+    """DALL-E 3 with explicit quality/style settings (the Images API path is shared)"""
 
-    def __init__(self, config: Dict[str, Any] = None):
-        super().__init__()
-        config = config or {}
-        self.model = config.get("model", "dall-e-3")
-        self.quality = config.get("quality", "standard")
-        self.size = config.get("size", "1024x1024")
-
-    async def render(self, project: str, prompt: str, **kwargs) -> RenderResult:
-        """Generate image using DALL-E"""
-        start_time = datetime.utcnow()
-
-        # TODO: Implement DALL-E API call
-        # 1. Format prompt for DALL-E
-        # 2. Call OpenAI Images API
-        # 3. Download and save image
-        # 4. Return result with metadata
-
-        # Placeholder implementation
-        await asyncio.sleep(3)  # Simulate API call
+    name = "dalle"
 
-        generation_time = (datetime.utcnow() - start_time).total_seconds()
-
-        return RenderResult(
-            image_path="/tmp/dalle_placeholder.png",  # TODO: actual path
-            metadata={
-                "adapter": self.name,
-                "model": self.model,
-                "prompt": prompt,
-                "quality": self.quality,
-                "size": self.size,
-                "api_version": "dall-e-3",
-            },
-            generation_time=generation_time,
-            timestamp=start_time,
-            seed=None,  # DALL-E doesn't expose seeds
-        )
-
-    async def is_available(self) -> bool:
-        """Check if OpenAI API is accessible"""
-        try:
-            # TODO: Implement actual API health check
-            return True
-        except Exception:
-            return False
+    def __init__(self, config: Dict[str, Any] = None):
+        config = {**self.get_default_config(), **(config or {})}
+        self.model = config["model"]
+        self.quality = config["quality"]
+        self.default_size = config["size"]
+        self.style = config["style"]
 
     def get_default_config(self) -> Dict[str, Any]:
         return {
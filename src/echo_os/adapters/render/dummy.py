@@ -2,18 +2,51 @@
 
 from __future__ import annotations
 import time
-from .base import BaseRenderAdapter, RenderResult
-from ...artifacts.storage import artifact_path, write_meta
+from typing import List, Optional, Sequence, Union
+from .base import BaseRenderAdapter, Capabilities, RenderResult
+from ...artifacts.storage import atomic_write_bytes, resolve_output, write_meta
 
 
 class DummyRenderAdapter(BaseRenderAdapter):
     name = "dummy"
+    capabilities = Capabilities(media="text", max_concurrency=64)
 
     async def render(self, project: str, prompt: str, **kwargs) -> RenderResult:
         """Generate dummy artifact file"""
-        out = artifact_path(project, self.name, seed=str(time.time()))
-        img = out / "echo.txt"
-        img.write_text(f"[rendered:{prompt}]")
-        meta = {"adapter": self.name, "prompt": prompt}
-        write_meta(out, meta)
-        return RenderResult(path=img, meta=meta)
+        return self._write(project, prompt, **kwargs)
+
+    async def render_many(
+        self,
+        project: str,
+        prompts: Sequence[str],
+        *,
+        targets: Optional[Sequence] = None,
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> List[Union[RenderResult, BaseException]]:
+        """Stubs are tiny: write them inline, no task per prompt"""
+        results: List[Union[RenderResult, BaseException]] = []
+        for prompt, target in zip(prompts, targets or [None] * len(prompts)):
+            try:
+                results.append(self._write(project, prompt, **{**kwargs, "target": target}))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def _write(self, project: str, prompt: str, **kwargs) -> RenderResult:
+        started = time.perf_counter()
+        img, meta_dir = resolve_output(project, self.name, "echo.txt", kwargs.get("target"))
+        atomic_write_bytes(img, f"[rendered:{prompt}]".encode())
+        meta = {
+            "adapter": self.name,
+            "prompt": prompt,
+            "duration_ms": self._elapsed_ms(started),
+        }
+        if meta_dir:
+            write_meta(meta_dir, meta)
+        result = RenderResult(path=img, meta=meta)
+        self._register(project, prompt, result, **kwargs)
+        return result
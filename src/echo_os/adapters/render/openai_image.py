@@ -1,20 +1,44 @@
 """OpenAI Images API Adapter — gpt-image-1 integration"""
 
 from __future__ import annotations
-import base64
 import time
+from typing import Optional
+import httpx
 from openai import OpenAI
-from .base import BaseRenderAdapter, RenderResult
-from ...artifacts.storage import artifact_path, write_meta
+from .base import BaseRenderAdapter, Capabilities, RenderResult
+from ...config import settings
+from ...artifacts.storage import (
+    CHUNK_SIZE,
+    awrite_chunks,
+    iter_b64decode,
+    resolve_output,
+    write_chunks,
+    write_meta,
+)
 
 
 class OpenAIImageRenderAdapter(BaseRenderAdapter):
     name = "openai-image"
+    capabilities = Capabilities(sizes=("1024x1024", "1024x1792", "1792x1024"), max_concurrency=4)
+    model = "dall-e-3"
+    default_size = "1024x1024"
+    quality: Optional[str] = None
+    style: Optional[str] = None
+
+    async def is_available(self) -> bool:
+        """API key set and the model visible to it"""
+        if not settings.openai_api_key:
+            return False
+        from ...openai_client import get_client
+
+        await get_client().models.retrieve(self.model)
+        return True
 
     async def render(self, project: str, prompt: str, **kwargs) -> RenderResult:
         """Generate image using OpenAI Images API"""
+        started = time.perf_counter()
         client = OpenAI()
-        size = kwargs.get("size", "1024x1024")
+        size = kwargs.get("size", self.default_size)
 
         # Call OpenAI Images API (using DALL-E 3 for now)
         # Check if prompt contains 9:16 aspect ratio request
@@ -29,39 +53,51 @@ class OpenAIImageRenderAdapter(BaseRenderAdapter):
         else:
             size = size  # Use provided size
 
+        options = {k: v for k, v in (("quality", self.quality), ("style", self.style)) if v}
         response = client.images.generate(
-            model="dall-e-3",
+            model=self.model,
             prompt=prompt,
             size=size,
             n=1,
+            **options,
         )
 
         # Get image data (DALL-E 3 returns URL, not b64_json)
         image_data = response.data[0]
 
-        # Create artifact directory
-        out = artifact_path(project, self.name, seed=str(time.time()))
-        img_path = out / "image.png"
-
-        # Download image from URL
-        import httpx
+        # Resolve output location (caller's target, or a fresh artifact directory)
+        img_path, meta_dir = resolve_output(
+            project, self.name, "image.png", kwargs.get("target")
+        )
 
+        # Stream to a temp file in CHUNK_SIZE pieces and rename into place, so
+        # memory per in-flight render is bounded by the chunk size, not the PNG
+        checksum = kwargs.get("checksum", True)
         if image_data.b64_json:
-            # Use base64 data if available
-            img_path.write_bytes(base64.b64decode(image_data.b64_json))
+            # Inline payload: decode incrementally
+            sha256 = write_chunks(img_path, iter_b64decode(image_data.b64_json), checksum)
         else:
             # Download from URL
-            async with httpx.AsyncClient() as client:
-                img_response = await client.get(image_data.url)
-                img_path.write_bytes(img_response.content)
+            async with httpx.AsyncClient(timeout=120) as http:
+                async with http.stream("GET", image_data.url) as img_response:
+                    img_response.raise_for_status()
+                    sha256 = await awrite_chunks(
+                        img_path, img_response.aiter_bytes(CHUNK_SIZE), checksum
+                    )
 
         # Write metadata
         meta = {
             "adapter": self.name,
             "prompt": prompt,
             "size": size,
-            "model": "dall-e-3",
+            "model": self.model,
+            **options,
+            "sha256": sha256,
+            "duration_ms": self._elapsed_ms(started),
         }
-        write_meta(out, meta)
+        if meta_dir:
+            write_meta(meta_dir, meta)
 
-        return RenderResult(path=img_path, meta=meta)
+        result = RenderResult(path=img_path, meta=meta)
+        self._register(project, prompt, result, **kwargs)
+        return result
@@ -0,0 +1,198 @@
+"""Render Pool Adapter — spread renders across several ComfyUI servers
+
+Each prompt (or batch, for render_many) goes to the healthy backend with the
+fewest renders in flight (least outstanding requests). A failed render is retried on another backend;
+the failing one is ejected for `comfy_pool_eject_seconds` and only re-admitted
+after answering a health probe.
+"""
+
+from __future__ import annotations
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Set, Union
+import httpx
+from .base import BaseRenderAdapter, Capabilities, RenderResult
+from .comfyui import ComfyUIError, ComfyUIRenderAdapter
+from ...config import settings
+
+
+@dataclass(eq=False)
+class Backend:
+    adapter: ComfyUIRenderAdapter
+    outstanding: int = 0
+    completed: int = 0
+    failures: int = 0  # consecutive
+    ejected_until: float = 0.0
+    last_error: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def url(self) -> str:
+        return self.adapter.base_url
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+    def summary(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "completed": self.completed,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class RenderPoolAdapter(BaseRenderAdapter):
+    name = "comfy-pool"
+
+    # Workflow/job errors eject a backend only after this many in a row; a
+    # transport error (server down, 5xx) ejects it at once
+    MAX_FAILURES = 3
+
+    def __init__(self, backends: Optional[Sequence[ComfyUIRenderAdapter]] = None):
+        if backends is None:
+            urls = settings.comfy_pool or [f"{settings.comfy_host}:{settings.comfy_port}"]
+            backends = [ComfyUIRenderAdapter(url) for url in urls]
+        if not backends:
+            raise ValueError("render pool needs at least one backend")
+        self.backends = [Backend(b) for b in backends]
+        per_node = ComfyUIRenderAdapter.capabilities.max_concurrency
+        self.capabilities = Capabilities(
+            batch=True, max_concurrency=per_node * len(self.backends), needs_gpu=True
+        )
+        self._next = 0  # round-robin tie-break
+        self._checked = 0.0
+        self._probing: Set[Backend] = set()
+
+    def stats(self) -> List[dict]:
+        return [b.summary() for b in self.backends]
+
+    async def is_available(self) -> bool:
+        """At least one backend answers"""
+        return any(b["healthy"] for b in await self.check_health())
+
+    async def check_health(self) -> List[dict]:
+        """Probe every backend now; eject the ones that don't answer"""
+        self._checked = time.monotonic()
+        ok = await asyncio.gather(*(b.adapter.health() for b in self.backends))
+        for backend, alive in zip(self.backends, ok):
+            if alive:
+                backend.ejected_until = 0.0
+            elif backend.healthy:
+                self._eject(backend, "health check failed")
+        return self.stats()
+
+    async def _readmit(self) -> None:
+        """Probe ejected backends whose ejection expired (and everyone, periodically)"""
+        now = time.monotonic()
+        if now - self._checked >= settings.comfy_pool_health_interval:
+            await self.check_health()
+            return
+        due = [
+            b
+            for b in self.backends
+            if b.ejected_until and b.healthy and b not in self._probing
+        ]
+        if not due:
+            return
+        self._probing.update(due)
+        try:
+            ok = await asyncio.gather(*(b.adapter.health() for b in due))
+        finally:
+            self._probing.difference_update(due)
+        for backend, alive in zip(due, ok):
+            if alive:
+                backend.ejected_until, backend.failures = 0.0, 0
+            else:
+                self._eject(backend, "health check failed")
+
+    def _eject(self, backend: Backend, reason: str) -> None:
+        backend.ejected_until = time.monotonic() + settings.comfy_pool_eject_seconds
+        backend.last_error = reason
+        print(f"⚠️  Render pool: ejecting {backend.url} ({reason})")
+
+    def _pick(self, exclude: Set[Backend]) -> Optional[Backend]:
+        candidates = [b for b in self.backends if b.healthy and b not in exclude]
+        if not candidates:
+            # Everyone is ejected: better to try an ejected node than fail outright
+            candidates = [b for b in self.backends if b not in exclude]
+        if not candidates:
+            return None
+        n = len(self.backends)
+        order = {b: (self.backends.index(b) - self._next) % n for b in candidates}
+        backend = min(candidates, key=lambda b: (b.outstanding, order[b]))
+        self._next = (self.backends.index(backend) + 1) % n
+        return backend
+
+    async def render(self, project: str, prompt: str, **kwargs) -> RenderResult:
+        """Render on the least busy healthy backend, failing over to the others"""
+        await self._readmit()
+        target = kwargs.pop("target", None)
+        return (await self._dispatch(project, [prompt], [target], **kwargs))[0]
+
+    async def _dispatch(
+        self, project: str, prompts: Sequence[str], targets: Sequence, **kwargs
+    ) -> List[RenderResult]:
+        """Run one batch on a backend, moving it to the next one if it fails"""
+        tried: Set[Backend] = set()
+        last_error: Optional[Exception] = None
+        while (backend := self._pick(tried)) is not None:
+            tried.add(backend)
+            backend.outstanding += len(prompts)  # no await since _pick: the count is exact
+            try:
+                results = await backend.adapter.render_many(
+                    project, prompts, targets=targets, **{**kwargs, "register": False}
+                )
+            except (httpx.HTTPError, OSError, ComfyUIError) as e:
+                last_error = e
+                backend.failures += 1
+                if not isinstance(e, ComfyUIError) or backend.failures >= self.MAX_FAILURES:
+                    self._eject(backend, f"{type(e).__name__}: {e}")
+                else:
+                    backend.last_error = str(e)
+                continue
+            finally:
+                backend.outstanding -= len(prompts)
+            backend.failures = 0
+            backend.completed += len(prompts)
+            for prompt, result in zip(prompts, results):
+                result.meta["backend"] = backend.url
+                result.meta["attempts"] = len(tried)
+                self._register(project, prompt, result, **kwargs)
+            return results
+        raise ComfyUIError(f"all {len(self.backends)} render backends failed: {last_error}")
+
+    async def render_many(
+        self,
+        project: str,
+        prompts: Sequence[str],
+        *,
+        targets: Optional[Sequence] = None,
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> List[Union[RenderResult, BaseException]]:
+        """Split prompts into one batch per healthy backend (at most
+        `comfy_max_batch` each) and dispatch them all at once; a failed batch
+        moves whole to another node. `concurrency` caps batches in flight."""
+        await self._readmit()
+        targets = list(targets or [None] * len(prompts))
+        nodes = max(1, sum(b.healthy for b in self.backends))
+        size = max(1, min(settings.comfy_max_batch, -(-len(prompts) // nodes)))
+        chunks = [range(i, min(i + size, len(prompts))) for i in range(0, len(prompts), size)]
+        gate = asyncio.Semaphore(concurrency or len(chunks) or 1)
+
+        async def batch(idx: range) -> List[RenderResult]:
+            async with gate:
+                return await self._dispatch(
+                    project, [prompts[i] for i in idx], [targets[i] for i in idx], **kwargs
+                )
+
+        done = await asyncio.gather(*map(batch, chunks), return_exceptions=return_exceptions)
+        results: List[Union[RenderResult, BaseException]] = []
+        for idx, out in zip(chunks, done):
+            results.extend([out] * len(idx) if isinstance(out, BaseException) else out)
+        return results
@@ -0,0 +1,103 @@
+"""Render adapter registry — lazy singletons, plugins and cached health
+
+Built-in adapters are referenced by import path and only imported when first
+asked for; every adapter is created once and reused. Third-party packages add
+adapters through the `echo_os.render_adapters` entry-point group:
+
+    [project.entry-points."echo_os.render_adapters"]
+    my-backend = "my_pkg.render:MyRenderAdapter"
+"""
+
+from __future__ import annotations
+import asyncio
+import importlib
+import time
+from importlib.metadata import entry_points
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from .base import BaseRenderAdapter
+from ...config import settings
+
+ENTRY_POINT_GROUP = "echo_os.render_adapters"
+
+Factory = Union[str, Callable[[], BaseRenderAdapter]]
+
+_factories: Dict[str, Factory] = {
+    "dummy": "echo_os.adapters.render.dummy:DummyRenderAdapter",
+    "openai-image": "echo_os.adapters.render.openai_image:OpenAIImageRenderAdapter",
+    "dalle": "echo_os.adapters.render.dalle:DALLERenderAdapter",
+    "comfyui": "echo_os.adapters.render.comfyui:ComfyUIRenderAdapter",
+    "comfy-pool": "echo_os.adapters.render.pool:RenderPoolAdapter",
+}
+_instances: Dict[str, BaseRenderAdapter] = {}
+_health: Dict[str, Tuple[float, bool, Optional[str]]] = {}  # name -> (checked, ok, error)
+_plugins_loaded = False
+
+
+def register_adapter(name: str, factory: Factory) -> None:
+    """Add or replace an adapter; `factory` is a class/callable or "module:attr" path"""
+    _factories[name] = factory
+    _instances.pop(name, None)
+    _health.pop(name, None)
+
+
+def _load_plugins() -> None:
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        if ep.name in _factories:
+            print(f"⚠️  Render adapter plugin '{ep.name}' shadows a built-in; ignored")
+            continue
+        _factories[ep.name] = lambda ep=ep: ep.load()()
+
+
+def adapter_names() -> List[str]:
+    _load_plugins()
+    return sorted(_factories)
+
+
+def _create(factory: Factory) -> BaseRenderAdapter:
+    if isinstance(factory, str):
+        module, _, attr = factory.partition(":")
+        factory = getattr(importlib.import_module(module), attr)
+    return factory()
+
+
+def get_adapter(adapter_name: str) -> BaseRenderAdapter:
+    """Shared adapter instance, created on first use"""
+    adapter = _instances.get(adapter_name)
+    if adapter is None:
+        _load_plugins()
+        if adapter_name not in _factories:
+            raise ValueError(f"Unknown adapter: {adapter_name}")
+        adapter = _instances[adapter_name] = _create(_factories[adapter_name])
+    return adapter
+
+
+async def adapter_health(adapter_name: str, refresh: bool = False) -> Tuple[bool, Optional[str]]:
+    """(available, error) — probed at most every `adapter_health_ttl` seconds"""
+    cached = _health.get(adapter_name)
+    if cached and not refresh and time.monotonic() - cached[0] < settings.adapter_health_ttl:
+        return cached[1], cached[2]
+    try:
+        adapter = get_adapter(adapter_name)
+        ok = bool(await asyncio.wait_for(adapter.is_available(), settings.adapter_health_timeout))
+        error = None if ok else "health probe failed"
+    except ValueError:
+        raise
+    except Exception as e:
+        ok, error = False, f"{type(e).__name__}: {e}"
+    _health[adapter_name] = (time.monotonic(), ok, error)
+    return ok, error
+
+
+async def describe_adapter(adapter_name: str, refresh: bool = False) -> dict:
+    adapter = get_adapter(adapter_name)
+    ok, error = await adapter_health(adapter_name, refresh)
+    return {
+        "name": adapter_name,
+        "available": ok,
+        "error": error,
+        "capabilities": adapter.capabilities.as_dict(),
+    }
@@ -1,6 +1,14 @@
+import asyncio
 import json
 import hashlib
-from typing import Dict, Any, Tuple, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Optional
+
+from ..config import settings
+from ..artifacts.storage import atomic_write_bytes
 
 
 def _h(s: str) -> str:
@@ -8,163 +16,486 @@ def _h(s: str) -> str:
     return hashlib.sha1(s.encode()).hexdigest()[:8]
 
 
+def _canonical(data: Any) -> str:
+    return json.dumps(data, sort_keys=True, ensure_ascii=False)
+
+
+class FrozenProfile(dict):
+    """Immutable frequency profile; its hash and prompt parts are computed once"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("frequency profiles are immutable; use compose_frequency()")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    @property
+    def digest(self) -> str:
+        # Same value the old per-scene _h(json.dumps(freq, sort_keys=True)) gave:
+        # tuples serialise exactly like the lists they replaced
+        if "_digest" not in self.__dict__:
+            self.__dict__["_digest"] = _h(json.dumps(self, sort_keys=True))
+        return self.__dict__["_digest"]
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (freeze, (thaw(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into FrozenProfile and lists into tuples"""
+    if isinstance(value, FrozenProfile):
+        return value
+    if isinstance(value, dict):
+        return FrozenProfile((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of a (possibly frozen) profile"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
+
+
+def _deep_merge(out: Dict[str, Any], override: Dict[str, Any]) -> None:
+    for k, v in override.items():
+        if isinstance(v, dict) and isinstance(out.get(k), dict):
+            _deep_merge(out[k], v)
+        else:
+            out[k] = v
+
+
+@lru_cache(maxsize=1024)
+def _compose(base: FrozenProfile, *overrides: str) -> FrozenProfile:
+    out = thaw(base)
+    for override in overrides:
+        _deep_merge(out, json.loads(override))
+    return freeze(out)
+
+
 def compose_frequency(
     base_profile: Dict[str, Any],
     story_override: Optional[Dict[str, Any]] = None,
     scene_override: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
-    """Compose final frequency profile from base, story, and scene overrides"""
-    out = dict(base_profile)
-
-    for override in [story_override or {}, scene_override or {}]:
-        for k, v in override.items():
-            if isinstance(v, dict) and isinstance(out.get(k), dict):
-                out[k].update(v)
-            else:
-                out[k] = v
-
-    return out
+) -> FrozenProfile:
+    """Compose final frequency profile from base, story, and scene overrides
 
+    Overrides are deep-merged into a new immutable profile; the base is never
+    modified. Results are memoized on (base, overrides), and with no overrides
+    the (frozen) base itself is returned.
+    """
+    base = freeze(base_profile)
+    overrides = [_canonical(o) for o in (story_override, scene_override) if o]
+    if not overrides:
+        return base
+    return _compose(base, *overrides)
 
-def modulate_prompt(
-    prompt: str, freq: Dict[str, Any], bible_data: Optional[Dict[str, Any]] = None
-) -> Tuple[str, str]:
-    """Modulate prompt with frequency and bible data for character consistency"""
 
-    # Start with original prompt
-    modulated_parts = [prompt]
+def _freq_parts(freq: Dict[str, Any]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Prompt parts contributed by a profile: (modulations, negatives)"""
+    parts = []
 
-    # Add frequency-based modulations
     if base_color := freq.get("base_color"):
-        modulated_parts.append(f"color scheme {base_color}")
+        parts.append(f"color scheme {base_color}")
 
     if emotional_palette := freq.get("emotional_palette"):
-        if isinstance(emotional_palette, list) and emotional_palette:
-            modulated_parts.append(f"tone {', '.join(emotional_palette[:2])}")
+        if isinstance(emotional_palette, (list, tuple)) and emotional_palette:
+            parts.append(f"tone {', '.join(emotional_palette[:2])}")
 
     if narrative_motif := freq.get("narrative_motif"):
-        modulated_parts.append(f"motif {narrative_motif}")
+        parts.append(f"motif {narrative_motif}")
 
     if camera_bias := freq.get("camera_bias"):
-        modulated_parts.append(camera_bias)
+        parts.append(camera_bias)
 
     if weights := freq.get("weights"):
         if weights.get("documentary", 0) > 0.6:
-            modulated_parts.append("documentary realism")
+            parts.append("documentary realism")
         if weights.get("surreal", 0) > 0.5:
-            modulated_parts.append("subtle surreal symbolism")
+            parts.append("subtle surreal symbolism")
         if weights.get("warmth", 0) > 0.6:
-            modulated_parts.append("warm light bias")
-
-    # Add bible-based character consistency
-    if bible_data:
-        # Character consistency
-        if characters := bible_data.get("characters"):
-            char_descriptions = []
-            for char in characters:
-                if isinstance(char, dict) and "name" in char and "desc" in char:
-                    char_descriptions.append(f"{char['name']}: {char['desc']}")
-                elif (
-                    isinstance(char, dict) and "name" in char and "description" in char
-                ):
-                    char_descriptions.append(f"{char['name']}: {char['description']}")
-
-            if char_descriptions:
-                modulated_parts.append(f"CHARACTERS: {', '.join(char_descriptions)}")
-
-        # World consistency
-        if world := bible_data.get("world"):
-            modulated_parts.append(f"WORLD: {world}")
-
-        # Style consistency
-        if style := bible_data.get("style"):
-            modulated_parts.append(f"STYLE: {style}")
-
-        # Props consistency
-        if props := bible_data.get("props"):
-            if isinstance(props, list):
-                prop_descriptions = []
-                for prop in props:
-                    if isinstance(prop, dict) and "name" in prop and "desc" in prop:
-                        prop_descriptions.append(f"{prop['name']}: {prop['desc']}")
-                    elif isinstance(prop, str):
-                        prop_descriptions.append(prop)
-
-                if prop_descriptions:
-                    modulated_parts.append(f"PROPS: {', '.join(prop_descriptions)}")
-
-        # Camera consistency
-        if camera := bible_data.get("camera"):
-            if isinstance(camera, dict):
-                camera_parts = []
-                if lens := camera.get("lens"):
-                    camera_parts.append(f"lens {lens}")
-                if look := camera.get("look"):
-                    camera_parts.append(look)
-                if dof := camera.get("dof"):
-                    camera_parts.append(f"depth of field {dof}")
-
-                if camera_parts:
-                    modulated_parts.append(f"CAMERA: {', '.join(camera_parts)}")
-
-        # Lighting consistency
-        if lighting := bible_data.get("lighting_palette"):
-            modulated_parts.append(f"LIGHTING: {lighting}")
-        elif lighting := bible_data.get("lighting"):
-            if isinstance(lighting, list):
-                modulated_parts.append(f"LIGHTING: {', '.join(lighting)}")
-            else:
-                modulated_parts.append(f"LIGHTING: {lighting}")
-
-    # Add negatives
-    if negatives := freq.get("negatives"):
-        if isinstance(negatives, list):
-            modulated_parts.append(", ".join(negatives))
-
-    # Combine all parts
-    modulated_prompt = " ; ".join(modulated_parts)
-
-    # Generate frequency hash
-    freq_hash = _h(json.dumps(freq, sort_keys=True))
-
-    return modulated_prompt, freq_hash
+            parts.append("warm light bias")
+
+    negatives: Tuple[str, ...] = ()
+    if neg := freq.get("negatives"):
+        if isinstance(neg, (list, tuple)):
+            negatives = (", ".join(neg),)
+
+    return tuple(parts), negatives
+
+
+def compile_bible(bible_data: Optional[Dict[str, Any]]) -> Tuple[str, ...]:
+    """Character/world consistency parts of a story bible; build once per story"""
+    parts: List[str] = []
+    if not bible_data:
+        return ()
+
+    # Character consistency
+    if characters := bible_data.get("characters"):
+        char_descriptions = []
+        for char in characters:
+            if isinstance(char, dict) and "name" in char and "desc" in char:
+                char_descriptions.append(f"{char['name']}: {char['desc']}")
+            elif isinstance(char, dict) and "name" in char and "description" in char:
+                char_descriptions.append(f"{char['name']}: {char['description']}")
+
+        if char_descriptions:
+            parts.append(f"CHARACTERS: {', '.join(char_descriptions)}")
+
+    # World consistency
+    if world := bible_data.get("world"):
+        parts.append(f"WORLD: {world}")
+
+    # Style consistency
+    if style := bible_data.get("style"):
+        parts.append(f"STYLE: {style}")
+
+    # Props consistency
+    if props := bible_data.get("props"):
+        if isinstance(props, (list, tuple)):
+            prop_descriptions = []
+            for prop in props:
+                if isinstance(prop, dict) and "name" in prop and "desc" in prop:
+                    prop_descriptions.append(f"{prop['name']}: {prop['desc']}")
+                elif isinstance(prop, str):
+                    prop_descriptions.append(prop)
+
+            if prop_descriptions:
+                parts.append(f"PROPS: {', '.join(prop_descriptions)}")
+
+    # Camera consistency
+    if camera := bible_data.get("camera"):
+        if isinstance(camera, dict):
+            camera_parts = []
+            if lens := camera.get("lens"):
+                camera_parts.append(f"lens {lens}")
+            if look := camera.get("look"):
+                camera_parts.append(look)
+            if dof := camera.get("dof"):
+                camera_parts.append(f"depth of field {dof}")
+
+            if camera_parts:
+                parts.append(f"CAMERA: {', '.join(camera_parts)}")
+
+    # Lighting consistency
+    if lighting := bible_data.get("lighting_palette"):
+        parts.append(f"LIGHTING: {lighting}")
+    elif lighting := bible_data.get("lighting"):
+        if isinstance(lighting, (list, tuple)):
+            parts.append(f"LIGHTING: {', '.join(lighting)}")
+        else:
+            parts.append(f"LIGHTING: {lighting}")
+
+    return tuple(parts)
 
 
-def load_default_profile() -> Dict[str, Any]:
-    """Load default frequency profile"""
-    try:
-        with open("frequency/profile.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
+def modulate_prompt(
+    prompt: str,
+    freq: Dict[str, Any],
+    bible_data: Optional[Dict[str, Any]] = None,
+    *,
+    bible_suffix: Optional[Tuple[str, ...]] = None,
+) -> Tuple[str, str]:
+    """Modulate prompt with frequency and bible data for character consistency
+
+    Pass `bible_suffix=compile_bible(bible)` to reuse one compiled bible across
+    scenes. For a FrozenProfile the profile parts and hash are cached on the
+    instance, so per-scene cost is a single string join.
+    """
+    if isinstance(freq, FrozenProfile):
+        cached = freq.__dict__.get("_parts")
+        if cached is None:
+            cached = freq.__dict__["_parts"] = _freq_parts(freq)
+        head, negatives = cached
+        freq_hash = freq.digest
+    else:
+        head, negatives = _freq_parts(freq)
+        freq_hash = _h(json.dumps(freq, sort_keys=True))
+
+    if bible_suffix is None:
+        bible_suffix = compile_bible(bible_data)
+
+    return " ; ".join((prompt, *head, *bible_suffix, *negatives)), freq_hash
+
+
+DEFAULT_PROFILE = freeze(
+    {
+        "id": "default_v1",
+        "title": "Default Profile",
+        "base_color": "neutral",
+        "emotional_palette": ["neutral"],
+        "narrative_motif": "standard",
+        "camera_bias": "35mm, standard",
+        "negatives": ["no text", "no logos", "no watermark"],
+        "weights": {"warmth": 0.5, "surreal": 0.5, "documentary": 0.5},
+    }
+)
+
+_STR_FIELDS = ("id", "title", "base_color", "narrative_motif", "camera_bias")
+_STR_LIST_FIELDS = ("emotional_palette", "negatives")
+
+
+def validate_profile(data: Any) -> List[str]:
+    """Problems that would make a frequency profile unusable; empty when valid"""
+    if not isinstance(data, dict):
+        return ["profile must be a JSON object"]
+    errors = []
+    for key in _STR_FIELDS:
+        if key in data and not isinstance(data[key], str):
+            errors.append(f"{key}: expected a string")
+    for key in _STR_LIST_FIELDS:
+        value = data.get(key)
+        if value is not None and (
+            not isinstance(value, (list, tuple))
+            or not all(isinstance(v, str) for v in value)
+        ):
+            errors.append(f"{key}: expected a list of strings")
+    weights = data.get("weights")
+    if weights is not None:
+        if not isinstance(weights, dict):
+            errors.append("weights: expected an object")
+        else:
+            for k, v in weights.items():
+                if isinstance(v, bool) or not isinstance(v, (int, float)):
+                    errors.append(f"weights.{k}: expected a number")
+    return errors
+
+
+@dataclass
+class ProfileEntry:
+    """One profile file as last seen on disk"""
+
+    name: str
+    path: Path
+    version: Tuple[int, int]  # (mtime_ns, size)
+    profile: Optional[FrozenProfile] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def id(self) -> str:
+        return (self.profile or {}).get("id", self.name)
+
+    def summary(self) -> Dict[str, Any]:
+        profile = self.profile or {}
         return {
-            "id": "default_v1",
-            "title": "Default Profile",
-            "base_color": "neutral",
-            "emotional_palette": ["neutral"],
-            "narrative_motif": "standard",
-            "camera_bias": "35mm, standard",
-            "negatives": ["no text", "no logos", "no watermark"],
-            "weights": {"warmth": 0.5, "surreal": 0.5, "documentary": 0.5},
+            "name": self.name,
+            "id": self.id,
+            "title": profile.get("title"),
+            "valid": not self.errors,
+            "errors": self.errors,
+            "created_at": profile.get("created_at"),
+            "created_by": profile.get("created_by"),
+            "modified_at": datetime.fromtimestamp(self.version[0] / 1e9).isoformat(),
         }
 
 
+def _read_entry(path: Path, version: Tuple[int, int]) -> ProfileEntry:
+    entry = ProfileEntry(name=path.stem, path=path, version=version)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        entry.errors = [f"unreadable: {e}"]
+        return entry
+    entry.errors = validate_profile(data)
+    if not entry.errors:
+        entry.profile = freeze(data)
+    return entry
+
+
+def _scan(directory: Path, current: Dict[str, ProfileEntry]) -> Dict[str, ProfileEntry]:
+    """Re-read only the files whose (mtime, size) changed since the last scan"""
+    fresh: Dict[str, ProfileEntry] = {}
+    if not directory.is_dir():
+        return fresh
+    for path in sorted(directory.glob("*.json")):
+        if path.name.startswith("."):  # in-flight atomic writes
+            continue
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        version = (st.st_mtime_ns, st.st_size)
+        old = current.get(path.stem)
+        fresh[path.stem] = old if old and old.version == version else _read_entry(path, version)
+    return fresh
+
+
+class ProfileRegistry:
+    """In-memory index of frequency profiles and their snapshots.
+
+    Files are loaded, validated and frozen once per version. While the watcher
+    runs (`start()`, done by the app on startup) lookups are pure dict reads and
+    the index is refreshed on filesystem events (watchfiles/inotify, or polling
+    every `frequency_poll_interval` seconds). Without a watcher — CLI, scripts —
+    each lookup rescans the directory first, which costs one stat() per file.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self._root = root
+        self._profiles: Dict[str, ProfileEntry] = {}
+        self._snapshots: Dict[str, ProfileEntry] = {}
+        self._ids: Dict[str, str] = {}
+        self._stop: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.watching = False
+
+    @property
+    def root(self) -> Path:
+        return Path(self._root or settings.frequency_dir)
+
+    def refresh(self) -> None:
+        profiles = _scan(self.root, self._profiles)
+        snapshots = _scan(self.root / "snapshots", self._snapshots)
+        ids = {e.id: name for name, e in profiles.items() if e.profile}
+        # Swap whole dicts so concurrent readers never see a half-built index
+        self._profiles, self._snapshots, self._ids = profiles, snapshots, ids
+
+    def _current(self) -> None:
+        if not self.watching:
+            self.refresh()
+
+    def entries(self) -> List[ProfileEntry]:
+        self._current()
+        return list(self._profiles.values())
+
+    def snapshots(self) -> List[ProfileEntry]:
+        self._current()
+        return list(self._snapshots.values())
+
+    def entry(self, name: str) -> Optional[ProfileEntry]:
+        """Profile by file name or by its `id` field"""
+        self._current()
+        return self._profiles.get(name) or self._profiles.get(self._ids.get(name, ""))
+
+    def snapshot(self, snapshot_id: str) -> Optional[ProfileEntry]:
+        self._current()
+        return self._snapshots.get(snapshot_id)
+
+    def get(self, name: str) -> FrozenProfile:
+        """Profile `name`; FileNotFoundError / ValueError on failure"""
+        entry = self.entry(name)
+        if entry is None:
+            raise FileNotFoundError(name)
+        if entry.errors:
+            raise ValueError(f"{entry.path.name}: {'; '.join(entry.errors)}")
+        return entry.profile
+
+    def default(self) -> FrozenProfile:
+        try:
+            return self.get("profile")
+        except (OSError, ValueError):
+            return DEFAULT_PROFILE
+
+    def resolve(self, name: Optional[str] = None) -> FrozenProfile:
+        """Named profile, falling back to the default one"""
+        if not name:
+            return self.default()
+        try:
+            return self.get(name)
+        except FileNotFoundError:
+            return self.default()
+        except ValueError as e:
+            print(f"⚠️  Invalid frequency profile {e}; using default")
+            return self.default()
+
+    async def _watch(self, stop: asyncio.Event) -> None:
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            awatch = None
+
+        if awatch is not None:
+            try:
+                async for _ in awatch(self.root, stop_event=stop):
+                    await asyncio.to_thread(self.refresh)
+                return
+            except Exception as e:  # e.g. inotify watch limit reached
+                print(f"⚠️  Frequency watcher unavailable ({e}); polling instead")
+
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), settings.frequency_poll_interval)
+            except asyncio.TimeoutError:
+                await asyncio.to_thread(self.refresh)
+
+    async def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self.refresh)
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._watch(self._stop))
+        self.watching = True
+
+    async def stop(self) -> None:
+        self.watching = False
+        if self._task is not None:
+            self._stop.set()
+            try:
+                await asyncio.wait_for(self._task, 5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            self._task = None
+
+
+profiles = ProfileRegistry()
+
+
+def diff_profiles(
+    a: Dict[str, Any],
+    b: Dict[str, Any],
+    ignore: Tuple[str, ...] = ("id", "created_at", "created_by"),
+    _prefix: str = "",
+) -> List[Dict[str, Any]]:
+    """Key-level changes from `a` to `b`; nested objects are compared per key"""
+    changes: List[Dict[str, Any]] = []
+    for key in sorted(set(a) | set(b)):
+        if not _prefix and key in ignore:
+            continue
+        path = f"{_prefix}{key}"
+        if key not in b:
+            changes.append({"path": path, "op": "removed", "from": a[key]})
+        elif key not in a:
+            changes.append({"path": path, "op": "added", "to": b[key]})
+        elif isinstance(a[key], dict) and isinstance(b[key], dict):
+            changes += diff_profiles(a[key], b[key], ignore, f"{path}.")
+        elif a[key] != b[key]:
+            changes.append({"path": path, "op": "changed", "from": a[key], "to": b[key]})
+    return changes
+
+
+def load_default_profile() -> Dict[str, Any]:
+    """Load default frequency profile"""
+    return profiles.default()
+
+
 def create_frequency_snapshot(profile: Dict[str, Any], user: str) -> str:
     """Create a timestamped frequency snapshot"""
-    import datetime
-
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     snapshot_id = f"{profile.get('id', 'unknown')}_{user}_{timestamp}"
 
-    snapshot = dict(profile)
+    snapshot = thaw(profile)
     snapshot["id"] = snapshot_id
-    snapshot["created_at"] = datetime.datetime.now().isoformat()
+    snapshot["created_at"] = datetime.now().isoformat()
     snapshot["created_by"] = user
 
-    # Save snapshot
-    import os
-
-    os.makedirs("frequency/snapshots", exist_ok=True)
-    with open(f"frequency/snapshots/{snapshot_id}.json", "w") as f:
-        json.dump(snapshot, f, indent=2)
+    # Save snapshot; written atomically so the watcher never indexes a partial file
+    path = Path(settings.frequency_dir) / "snapshots" / f"{snapshot_id}.json"
+    atomic_write_bytes(path, json.dumps(snapshot, indent=2).encode())
 
     return snapshot_id
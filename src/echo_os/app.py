@@ -2,10 +2,14 @@ from __future__ import annotations
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .store import init_db
+from .artifacts.registry import registry
+from .adapters.resonance import profiles
 from .routers.api import router as api_router
 from .routers.pipeline import router as pipeline_router
 from .routers.captions import router as captions_router
 from .routers.video import router as video_router
+from .routers.frequency import router as frequency_router
+from .routers.adapters import router as adapters_router
 
 
 def create_app() -> FastAPI:
@@ -21,6 +25,12 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     async def _startup():
         await init_db()
+        await profiles.start()
+
+    @app.on_event("shutdown")
+    async def _shutdown():
+        await registry.aclose()
+        await profiles.stop()
 
     @app.get("/health")
     async def health():
@@ -30,6 +40,8 @@ def create_app() -> FastAPI:
     app.include_router(pipeline_router, prefix="/api/pipeline")
     app.include_router(captions_router, prefix="/api/captions")
     app.include_router(video_router, prefix="/api/video")
+    app.include_router(frequency_router, prefix="/api/frequency")
+    app.include_router(adapters_router, prefix="/api/adapters")
     return app
 
 
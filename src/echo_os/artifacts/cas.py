@@ -0,0 +1,129 @@
+"""Content-Addressed Store — deduplicated blobs behind the date/slug tree
+
+Blobs live under `<artifact_dir>/.cas/<sha256[:2]>/<sha256>`. Files in the
+human-readable tree are hard links to those blobs, so the inode link count is
+the reference count: a blob whose st_nlink is 1 is referenced by nothing but
+the store itself and `gc()` may reclaim it.
+
+When a hard link is impossible (different filesystem), a reflink clone or a
+plain copy is made instead; those copies are independent of the blob and do
+not hold a reference.
+"""
+
+from __future__ import annotations
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+from .storage import _root
+from .registry import file_sha256
+
+FICLONE = 0x40049409  # linux/fs.h
+
+
+def blob_root() -> Path:
+    return _root() / ".cas"
+
+
+def blob_path(digest: str) -> Path:
+    return blob_root() / digest[:2] / digest
+
+
+def _tmp_sibling(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def _clone(src: Path, dst: Path) -> None:
+    """Hard link, else reflink, else copy `src` to a new file `dst`"""
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    try:
+        import fcntl
+
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+        return
+    except (ImportError, OSError):
+        dst.unlink(missing_ok=True)
+    shutil.copyfile(src, dst)
+
+
+def link(digest: str, dest: Path) -> Path:
+    """Atomically make `dest` a reference to the blob `digest`"""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_sibling(dest)
+    _clone(blob_path(digest), tmp)
+    os.replace(tmp, dest)
+    return dest
+
+
+def adopt(path: Path, digest: Optional[str] = None) -> str:
+    """Take a freshly written file into the store without copying it.
+
+    New content: the blob becomes a second link to the file's inode. Known
+    content: `path` is swapped for a link to the existing blob, and the
+    duplicate bytes are freed.
+    """
+    path = Path(path)
+    digest = digest or file_sha256(path)
+    blob = blob_path(digest)
+    if blob.exists():
+        if not os.path.samefile(blob, path):
+            link(digest, path)
+        return digest
+
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(path, blob)
+    except FileExistsError:  # another writer stored the same content first
+        link(digest, path)
+    except OSError:  # artifact tree and store on different filesystems
+        tmp = _tmp_sibling(blob)
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, blob)
+    return digest
+
+
+def store(path: Path, dest: Path, digest: Optional[str] = None) -> str:
+    """Adopt `path` and expose it at `dest` (both stay links to one blob)"""
+    digest = adopt(path, digest)
+    link(digest, dest)
+    return digest
+
+
+def gc(grace_seconds: float = 3600, dry_run: bool = False) -> Dict[str, int]:
+    """Delete blobs no file in the artifact tree links to.
+
+    Blobs younger than `grace_seconds` are kept so a render that has written
+    its blob but not yet linked it is never collected mid-flight.
+    """
+    stats = {"scanned": 0, "removed": 0, "reclaimed_bytes": 0, "kept": 0}
+    root = blob_root()
+    if not root.exists():
+        return stats
+    cutoff = time.time() - grace_seconds
+    for shard in root.iterdir():
+        if not shard.is_dir():
+            continue
+        for blob in shard.iterdir():
+            if blob.name.startswith("."):
+                continue
+            stats["scanned"] += 1
+            st = blob.stat()
+            # ctime moves on every link/unlink, so it also tracks the last dereference
+            if st.st_nlink > 1 or st.st_ctime > cutoff:
+                stats["kept"] += 1
+                continue
+            stats["removed"] += 1
+            stats["reclaimed_bytes"] += st.st_size
+            if not dry_run:
+                blob.unlink()
+        if not dry_run and not any(shard.iterdir()):
+            shard.rmdir()
+    return stats
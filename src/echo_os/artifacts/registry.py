@@ -0,0 +1,170 @@
+"""Artifact Registry — batched, asynchronous persistence of render outputs"""
+
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from .storage import _slugify
+
+KINDS = {
+    ".png": "image",
+    ".jpg": "image",
+    ".jpeg": "image",
+    ".webp": "image",
+    ".mp3": "audio",
+    ".wav": "audio",
+    ".mp4": "video",
+    ".txt": "text",
+}
+
+
+def kind_for(path: Path) -> str:
+    return KINDS.get(path.suffix.lower(), "file")
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha1(prompt.encode()).hexdigest()[:8]
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class PendingArtifact:
+    path: Path
+    adapter: str
+    project: str
+    kind: str
+    prompt_hash: str = ""
+    duration_ms: Optional[float] = None
+    sha256: str = ""
+    task_id: Optional[int] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class ArtifactRegistry:
+    """Queue render outputs and write them to the Artifact table in batches.
+
+    `register` never blocks the render path: it only enqueues. A background task
+    hashes the files off the event loop and inserts up to `batch_size` rows per
+    transaction, waiting at most `flush_interval` seconds to fill a batch.
+    """
+
+    def __init__(self, batch_size: int = 256, flush_interval: float = 0.5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._schema_ready = False
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        return self._queue
+
+    def register(
+        self,
+        path: Path,
+        adapter: str,
+        project: str,
+        prompt: Optional[str] = None,
+        duration_ms: Optional[float] = None,
+        kind: Optional[str] = None,
+        sha256: str = "",
+        **meta: Any,
+    ) -> None:
+        path = Path(path)
+        self._ensure_worker().put_nowait(
+            PendingArtifact(
+                path=path,
+                adapter=adapter,
+                project=_slugify(project) or "echo",
+                kind=kind or kind_for(path),
+                prompt_hash=prompt_hash(prompt) if prompt else "",
+                duration_ms=duration_ms,
+                sha256=sha256,
+                meta=meta,
+            )
+        )
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch: List[PendingArtifact] = [await queue.get()]
+            deadline = self._loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write(batch)
+            except Exception as e:
+                print(f"⚠️  Artifact registry write failed ({len(batch)} rows): {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _write(self, batch: List[PendingArtifact]) -> None:
+        from ..models import Artifact
+        from ..store import init_db, session_scope
+
+        if not self._schema_ready:
+            await init_db()
+            self._schema_ready = True
+
+        def describe(p: PendingArtifact):
+            if not p.path.is_file():
+                return 0, p.sha256
+            return p.path.stat().st_size, p.sha256 or file_sha256(p.path)
+
+        described = await asyncio.to_thread(lambda: [describe(p) for p in batch])
+        async with session_scope() as s:
+            s.add_all(
+                Artifact(
+                    task_id=p.task_id,
+                    project=p.project,
+                    adapter=p.adapter,
+                    kind=p.kind,
+                    path=str(p.path),
+                    size=size,
+                    sha256=sha,
+                    prompt_hash=p.prompt_hash,
+                    duration_ms=p.duration_ms,
+                    meta=json.dumps(p.meta, ensure_ascii=False) if p.meta else "",
+                    created_at=p.created_at,
+                )
+                for p, (size, sha) in zip(batch, described)
+            )
+
+    async def flush(self) -> None:
+        """Wait until everything registered so far is persisted"""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def aclose(self) -> None:
+        await self.flush()
+        if self._task is not None and self._loop is asyncio.get_running_loop():
+            self._task.cancel()
+        self._task = None
+
+
+registry = ArtifactRegistry()
+register_artifact = registry.register
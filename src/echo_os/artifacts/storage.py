@@ -1,10 +1,17 @@
 """Artifact Storage — File system organization for generated content"""
 
 from __future__ import annotations
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
+from typing import AsyncIterable, BinaryIO, Iterable, Iterator, Optional
+import base64
+import errno
 import hashlib
 import json
+import os
+import shutil
+import uuid
 from ..config import settings
 
 
@@ -33,3 +40,101 @@ def write_meta(dirpath: Path, meta: dict) -> Path:
     mp = dirpath / "meta.json"
     mp.write_text(json.dumps(meta, ensure_ascii=False, indent=2))
     return mp
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+@contextmanager
+def atomic_output(path: Path) -> Iterator[BinaryIO]:
+    """Open a temp file next to `path`; fsync and os.replace it into place on success.
+
+    Readers only ever see the previous file or the complete new one, never a
+    half-written image.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(path)
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> Path:
+    with atomic_output(path) as f:
+        f.write(data)
+    return Path(path)
+
+
+def move_file(src: Path, dst: Path) -> Path:
+    """Rename `src` to `dst`; across filesystems, copy to a temp sibling of `dst` and swap it in"""
+    src, dst = Path(src), Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        with open(src, "rb") as fsrc, atomic_output(dst) as fdst:
+            shutil.copyfileobj(fsrc, fdst, 1 << 20)
+        src.unlink()
+    return dst
+
+
+def resolve_output(project: str, adapter: str, filename: str, target=None):
+    """Where an adapter should write its output.
+
+    Without a target: a fresh `artifact_path` directory, which also gets the
+    adapter's meta.json. With a directory target: `filename` inside it. With a
+    file target: that path, keeping the adapter's own extension. Returns
+    (output_path, meta_dir_or_None).
+    """
+    if target is None:
+        out = artifact_path(project, adapter, seed=uuid.uuid4().hex)
+        return out / filename, out
+    target = Path(target)
+    if target.is_dir() or not target.suffix:
+        target.mkdir(parents=True, exist_ok=True)
+        return target / filename, None
+    return target.with_suffix(Path(filename).suffix), None
+
+
+CHUNK_SIZE = 1 << 16
+
+
+def write_chunks(path: Path, chunks: Iterable[bytes], sha256: bool = True) -> Optional[str]:
+    """Atomically write an iterable of chunks; returns the SHA-256 hex digest if asked"""
+    h = hashlib.sha256() if sha256 else None
+    with atomic_output(path) as f:
+        for chunk in chunks:
+            f.write(chunk)
+            if h:
+                h.update(chunk)
+    return h.hexdigest() if h else None
+
+
+async def awrite_chunks(
+    path: Path, chunks: AsyncIterable[bytes], sha256: bool = True
+) -> Optional[str]:
+    """Async counterpart of write_chunks for streamed HTTP bodies"""
+    h = hashlib.sha256() if sha256 else None
+    with atomic_output(path) as f:
+        async for chunk in chunks:
+            f.write(chunk)
+            if h:
+                h.update(chunk)
+    return h.hexdigest() if h else None
+
+
+def iter_b64decode(data: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Decode base64 in slices so only one decoded chunk is alive at a time"""
+    step = max(4, chunk_size // 3 * 4)  # whole 4-char quanta ≈ chunk_size bytes out
+    for i in range(0, len(data), step):
+        yield base64.b64decode(data[i : i + step])
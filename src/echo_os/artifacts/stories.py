@@ -0,0 +1,57 @@
+"""Story index — one pass over `<artifact_dir>/<date>/<slug>/meta.json`"""
+
+from __future__ import annotations
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from ..config import settings
+
+
+@dataclass(frozen=True)
+class StoryRef:
+    slug: str
+    date: str
+    dir: Path
+
+    @property
+    def meta_path(self) -> Path:
+        return self.dir / "meta.json"
+
+    def load_meta(self) -> Dict[str, Any]:
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def scan_stories(root: Optional[Path] = None) -> List[StoryRef]:
+    """Every story directory holding a meta.json, newest date first.
+
+    Uses os.scandir so the whole tree costs two directory listings per date
+    plus one stat per story, instead of a walk per lookup.
+    """
+    root = Path(root or settings.artifact_dir)
+    stories: List[StoryRef] = []
+    if not root.is_dir():
+        return stories
+    with os.scandir(root) as dates:
+        date_dirs = sorted(
+            (d for d in dates if d.is_dir() and not d.name.startswith(".")),
+            key=lambda d: d.name,
+            reverse=True,
+        )
+    for date in date_dirs:
+        with os.scandir(date.path) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir() and os.path.isfile(os.path.join(entry.path, "meta.json")):
+                    stories.append(StoryRef(slug=entry.name, date=date.name, dir=Path(entry.path)))
+    return stories
+
+
+def find_story(slug: str, stories: Optional[List[StoryRef]] = None) -> Optional[StoryRef]:
+    """Newest story named `slug`; falls back to the first name containing it"""
+    stories = scan_stories() if stories is None else stories
+    for story in stories:
+        if story.slug == slug:
+            return story
+    return next((s for s in stories if slug in s.slug), None)
@@ -0,0 +1,68 @@
+"""Bulk ingest — JSON array / NDJSON bodies inserted in chunked transactions"""
+
+from __future__ import annotations
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Type
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from .config import settings
+from .store import session_scope
+
+
+async def iter_bulk_body(request: Request, schema: Type[BaseModel]) -> AsyncIterator[BaseModel]:
+    """Yield validated items from a JSON array or a streamed NDJSON body"""
+    ctype = request.headers.get("content-type", "")
+    n = 0
+    try:
+        if "ndjson" in ctype or "jsonl" in ctype:
+            buf = b""
+            async for chunk in request.stream():
+                buf += chunk
+                *lines, buf = buf.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        n += 1
+                        yield schema.model_validate_json(line)
+            if buf.strip():
+                n += 1
+                yield schema.model_validate_json(buf)
+        else:
+            data = json.loads(await request.body() or b"[]")
+            if not isinstance(data, list):
+                raise HTTPException(422, "expected a JSON array or NDJSON body")
+            for n, item in enumerate(data, 1):
+                yield schema.model_validate(item)
+    except (ValidationError, ValueError) as e:
+        raise HTTPException(422, f"item {n}: {e}")
+
+
+async def _insert_chunk(model, rows: List[Dict[str, Any]]) -> List[int]:
+    # sort_by_parameter_order makes SQLAlchemy fall back to one INSERT per row on
+    # SQLite. Rowids of a batched insert are handed out ascending in row order, so
+    # sorting the RETURNING ids restores input order at multi-row VALUES speed.
+    async with session_scope() as s:
+        res = await s.execute(insert(model).returning(model.id), rows)
+        return sorted(res.scalars())
+
+
+async def bulk_insert(model, items: AsyncIterator[BaseModel]) -> List[int]:
+    """Insert items `db_bulk_chunk_size` rows per transaction; ids come back in input order.
+
+    Chunks commit independently, so a bad item halfway through leaves the earlier
+    chunks in place; the 422 detail reports their ids.
+    """
+    ids: List[int] = []
+    chunk: List[Dict[str, Any]] = []
+    try:
+        async for item in items:
+            chunk.append({**item.model_dump(), "created_at": datetime.utcnow()})
+            if len(chunk) >= settings.db_bulk_chunk_size:
+                ids += await _insert_chunk(model, chunk)
+                chunk = []
+        if chunk:
+            ids += await _insert_chunk(model, chunk)
+    except HTTPException as e:
+        raise HTTPException(e.status_code, {"error": e.detail, "inserted_ids": ids})
+    return ids
@@ -1,21 +1,33 @@
 from __future__ import annotations
 import asyncio
 import json
+from typing import List, Optional
 import typer
 from rich import print
 from .store import init_db
 from .executor import ensure_project, upsert_tasks
 from .planner import plan_from_intent
 from .echo import engine
-from .adapters.render.dummy import DummyRenderAdapter
-from .adapters.render.comfyui import ComfyUIRenderAdapter
-from .adapters.render.openai_image import OpenAIImageRenderAdapter
+from .adapters.render import get_adapter
 from .adapters.audio.openai_tts import tts_generate
 from .adapters.audio.openai_asr import transcribe
+from .artifacts.registry import registry
 
 app = typer.Typer(add_completion=False)
 
 
+def _run(coro):
+    """asyncio.run that persists queued artifact registrations before exiting"""
+
+    async def main():
+        try:
+            return await coro
+        finally:
+            await registry.aclose()
+
+    return asyncio.run(main())
+
+
 @app.command()
 def boot():
     print("[bold cyan]ECHO.PROTOCOL v1 — online[/]")
@@ -57,10 +69,51 @@ def plan(project: str, context: str):
     asyncio.run(run())
 
 
+@app.command()
+def search(
+    query: str,
+    kind: str = typer.Option(None, help="log | task | scene"),
+    limit: int = 20,
+):
+    """Full-text search over logs, tasks and scene prompts"""
+    from .store import read_scope
+    from .search import search as fts_search
+
+    async def run():
+        await init_db()
+        async with read_scope() as s:
+            hits = await fts_search(
+                s, query, kind=kind, limit=limit, mark=("[bold yellow]", "[/]")
+            )
+        if not hits:
+            print("[dim]no matches[/]")
+        for h in hits:
+            print(f"[cyan]{h['kind']}#{h['id']}[/] {h['title']}  [dim]({h['score']})[/]")
+            print(f"    {h['snippet']}")
+
+    asyncio.run(run())
+
+
+@app.command()
+def gc(
+    grace: float = typer.Option(3600, help="Keep blobs dereferenced within N seconds"),
+    dry_run: bool = typer.Option(False, "--dry-run"),
+):
+    """Reclaim content-addressed blobs no artifact links to any more"""
+    from .artifacts import cas
+
+    stats = cas.gc(grace_seconds=grace, dry_run=dry_run)
+    verb = "would reclaim" if dry_run else "reclaimed"
+    print(
+        f"🧹 {stats['scanned']} blobs scanned, {stats['removed']} unreferenced — "
+        f"{verb} {stats['reclaimed_bytes'] / 1e6:.1f} MB"
+    )
+
+
 @app.command()
 def render(prompt: str, project: str = "Default", adapter: str = "dummy"):
     async def run():
-        ad = DummyRenderAdapter() if adapter == "dummy" else ComfyUIRenderAdapter()
+        ad = get_adapter(adapter)
         res = await ad.render(project=project, prompt=prompt)
         print(
             json.dumps(
@@ -69,7 +122,7 @@ def render(prompt: str, project: str = "Default", adapter: str = "dummy"):
             )
         )
 
-    asyncio.run(run())
+    _run(run())
 
 
 @app.command()
@@ -81,23 +134,15 @@ def batch(project: str, file: str, adapter: str = "dummy"):
     import json
 
     async def run():
-        if adapter == "openai-image":
-            ad = OpenAIImageRenderAdapter()
-        elif adapter == "dummy":
-            ad = DummyRenderAdapter()
-        else:
-            ad = ComfyUIRenderAdapter()
-        out = []
-        for p in Path(file).read_text().splitlines():
-            if not p.strip():
-                continue
-            res = await ad.render(project=project, prompt=p.strip())
-            out.append(str(res.path))
+        ad = get_adapter(adapter)
+        prompts = [p.strip() for p in Path(file).read_text().splitlines() if p.strip()]
+        results = await ad.render_many(project, prompts)
+        out = [str(res.path) for res in results]
         print(json.dumps({"ok": True, "paths": out}, ensure_ascii=False))
 
     from pathlib import Path
 
-    asyncio.run(run())
+    _run(run())
 
 
 @app.command()
@@ -107,12 +152,12 @@ def render_openai(prompt: str, project: str = "Default", size: str = "1024x1024"
     import json
 
     async def run():
-        res = await OpenAIImageRenderAdapter().render(
+        res = await get_adapter("openai-image").render(
             project=project, prompt=prompt, size=size
         )
         print(json.dumps({"ok": True, "path": str(res.path)}, ensure_ascii=False))
 
-    asyncio.run(run())
+    _run(run())
 
 
 @app.command()
@@ -125,7 +170,7 @@ def tts(text: str, project: str = "Default", voice: str = "alloy"):
         path = await tts_generate(project=project, text=text, voice=voice)
         print(json.dumps({"ok": True, "path": str(path)}, ensure_ascii=False))
 
-    asyncio.run(run())
+    _run(run())
 
 
 @app.command()
@@ -162,17 +207,9 @@ def pipeline(
 
         # 1) Generate image
         if prompt:
-            if adapter == "openai-image":
-                res = await OpenAIImageRenderAdapter().render(
-                    project=project, prompt=prompt, size=size
-                )
-            else:
-                ad = (
-                    DummyRenderAdapter()
-                    if adapter == "dummy"
-                    else ComfyUIRenderAdapter()
-                )
-                res = await ad.render(project=project, prompt=prompt)
+            res = await get_adapter(adapter).render(
+                project=project, prompt=prompt, size=size
+            )
             results["images"].append(str(res.path))
 
         # 2) Generate audio
@@ -204,7 +241,7 @@ def pipeline(
 
         print(json.dumps({"ok": True, "pipeline": results}, ensure_ascii=False))
 
-    asyncio.run(run())
+    _run(run())
 
 
 @app.command()
@@ -223,6 +260,7 @@ def batch_pipeline(
 
     async def run():
         results = {"batches": []}
+        log_entries = []
 
         # Read prompts from file
         with open(prompts_file, "r") as f:
@@ -232,17 +270,9 @@ def batch_pipeline(
             batch_result = {"prompt": prompt, "images": [], "audios": [], "logs": []}
 
             # Generate image
-            if adapter == "openai-image":
-                res = await OpenAIImageRenderAdapter().render(
-                    project=project, prompt=prompt, size=size
-                )
-            else:
-                ad = (
-                    DummyRenderAdapter()
-                    if adapter == "dummy"
-                    else ComfyUIRenderAdapter()
-                )
-                res = await ad.render(project=project, prompt=prompt)
+            res = await get_adapter(adapter).render(
+                project=project, prompt=prompt, size=size
+            )
             batch_result["images"].append(str(res.path))
 
             # Generate audio
@@ -250,34 +280,39 @@ def batch_pipeline(
             audio_path = await tts_generate(project=project, text=text, voice=voice)
             batch_result["audios"].append(str(audio_path))
 
-            # Log to API
-            log_data = {
-                "code": f"ECHO.LOG/{i:03d}",
-                "title": f"Batch {i}: {prompt[:50]}...",
-                "content": f"Generated image and audio for: {prompt}",
-            }
-
-            try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        "http://127.0.0.1:8081/api/log",
-                        json=log_data,
-                        headers={"content-type": "application/json"},
-                    )
-                    if response.status_code == 200:
-                        batch_result["logs"].append("logged to API")
-                    else:
-                        batch_result["logs"].append(
-                            f"API error: {response.status_code}"
-                        )
-            except Exception as e:
-                batch_result["logs"].append(f"API error: {str(e)}")
+            # Queue log entry; all entries go to the API in one bulk request
+            log_entries.append(
+                {
+                    "code": f"ECHO.LOG/{i:03d}",
+                    "title": f"Batch {i}: {prompt[:50]}...",
+                    "content": f"Generated image and audio for: {prompt}",
+                }
+            )
 
             results["batches"].append(batch_result)
 
+        # Log to API
+        try:
+            async with httpx.AsyncClient(timeout=60) as client:
+                response = await client.post(
+                    "http://127.0.0.1:8081/api/log/bulk",
+                    json=log_entries,
+                    headers={"content-type": "application/json"},
+                )
+                if response.status_code == 200:
+                    ids = response.json()["ids"]
+                    for batch_result, log_id in zip(results["batches"], ids):
+                        batch_result["logs"].append(f"logged to API (#{log_id})")
+                else:
+                    for batch_result in results["batches"]:
+                        batch_result["logs"].append(f"API error: {response.status_code}")
+        except Exception as e:
+            for batch_result in results["batches"]:
+                batch_result["logs"].append(f"API error: {str(e)}")
+
         print(json.dumps({"ok": True, "batch_pipeline": results}, ensure_ascii=False))
 
-    asyncio.run(run())
+    _run(run())
 
 
 @app.command()
@@ -334,22 +369,63 @@ def ninegrid(
 
 @app.command()
 def captions(
-    slug: str,
-    platform: str = "instagram",
-    max_chars: int = 2200,
+    slug: Optional[str] = typer.Argument(None),
+    all_stories: bool = typer.Option(False, "--all", help="Caption every story"),
+    platform: List[str] = typer.Option(["instagram"], help="Repeat for several platforms"),
+    max_chars: Optional[int] = typer.Option(None, help="Default: per-platform limit"),
     include_hashtags: bool = True,
     include_story_beats: bool = True,
     include_tech_specs: bool = False,
+    concurrency: int = 8,
 ):
     """Generate Instagram captions and hashtags for a story"""
     import asyncio
     import httpx
 
+    if not slug and not all_stories:
+        raise typer.BadParameter("give a story slug or --all")
+
+    async def run_batch():
+        data = {
+            "slugs": None if all_stories else [slug],
+            "platforms": platform,
+            "max_chars": max_chars,
+            "include_hashtags": include_hashtags,
+            "include_story_beats": include_story_beats,
+            "include_tech_specs": include_tech_specs,
+            "concurrency": concurrency,
+        }
+        try:
+            async with httpx.AsyncClient(timeout=600) as client:
+                response = await client.post(
+                    "http://127.0.0.1:8081/api/captions/batch", json=data
+                )
+            if response.status_code != 200:
+                print(f"❌ Error: {response.status_code}")
+                print(f"Response: {response.text}")
+                return
+            result = response.json()
+            for r in result["results"]:
+                if r["ok"]:
+                    print(
+                        f"✅ {r['slug']} [{r['platform']}] "
+                        f"{r['caption_length']}/{r['max_chars']} → {r['saved_to']}"
+                    )
+                else:
+                    print(f"❌ {r['slug']}: {r['error']}")
+            print(f"\n📝 {result['successful']} captions written, {result['failed']} failed")
+        except Exception as e:
+            print(f"❌ Connection error: {e}")
+
+    if all_stories or len(platform) > 1:
+        asyncio.run(run_batch())
+        return
+
     async def run():
         data = {
             "slug": slug,
-            "platform": platform,
-            "max_chars": max_chars,
+            "platform": platform[0],
+            "max_chars": max_chars or 2200,
             "include_hashtags": include_hashtags,
             "include_story_beats": include_story_beats,
             "include_tech_specs": include_tech_specs,
@@ -10,20 +10,50 @@ class Settings(BaseModel):
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     openai_org: str | None = os.getenv("OPENAI_ORG")
     openai_project: str | None = os.getenv("OPENAI_PROJECT")
+    openai_base_url: str | None = os.getenv("OPENAI_BASE_URL") or None
     model: str = os.getenv("ECHO_MODEL", "gpt-4o-mini")
+
+    # LLM response cache (0 TTL disables it)
+    llm_cache_ttl: int = int(os.getenv("ECHO_LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+    llm_cache_max_entries: int = int(os.getenv("ECHO_LLM_CACHE_MAX_ENTRIES", "5000"))
     db_path: str = os.getenv("ECHO_DB", "echo.db")
 
+    # SQLite storage profile (applied as PRAGMAs on every pooled connection)
+    db_journal_mode: str = os.getenv("ECHO_DB_JOURNAL_MODE", "WAL")
+    db_synchronous: str = os.getenv("ECHO_DB_SYNCHRONOUS", "NORMAL")
+    db_mmap_size: int = int(os.getenv("ECHO_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+    db_cache_size: int = int(os.getenv("ECHO_DB_CACHE_SIZE", "-65536"))  # <0 means KiB
+    db_busy_timeout: int = int(os.getenv("ECHO_DB_BUSY_TIMEOUT", "5000"))  # ms
+    db_read_pool_size: int = int(os.getenv("ECHO_DB_READ_POOL_SIZE", "4"))
+    db_bulk_chunk_size: int = int(os.getenv("ECHO_DB_BULK_CHUNK_SIZE", "5000"))
+
     host: str = os.getenv("ECHO_HOST", "127.0.0.1")
     port: int = int(os.getenv("ECHO_PORT", "8081"))
     log_level: str = os.getenv("ECHO_LOG_LEVEL", "INFO")
     env: str = os.getenv("ECHO_ENV", "dev")
 
     artifact_dir: str = os.getenv("ECHO_ARTIFACT_DIR", "artifacts")
+    frequency_dir: str = os.getenv("ECHO_FREQUENCY_DIR", "frequency")
+    frequency_poll_interval: float = float(os.getenv("ECHO_FREQUENCY_POLL_INTERVAL", "2.0"))
+    hashtag_rules: str = os.getenv("ECHO_HASHTAG_RULES", "")  # default: bundled rules
     scheduler: bool = os.getenv("ECHO_SCHEDULER", "false").lower() == "true"
 
+    # Render adapter health probes (/api/adapters)
+    adapter_health_ttl: float = float(os.getenv("ECHO_ADAPTER_HEALTH_TTL", "30"))  # seconds
+    adapter_health_timeout: float = float(os.getenv("ECHO_ADAPTER_HEALTH_TIMEOUT", "5"))
+
     # ComfyUI & SD adapters
     comfy_host: str = os.getenv("COMFY_HOST", "http://127.0.0.1")
     comfy_port: int = int(os.getenv("COMFY_PORT", "8188"))
+    comfy_workflow: str = os.getenv("COMFY_WORKFLOW", "txt2img")
+    comfy_workflow_dir: str = os.getenv("COMFY_WORKFLOW_DIR", "")  # default: bundled workflows
+    comfy_max_batch: int = int(os.getenv("COMFY_MAX_BATCH", "9"))  # prompts per queued job
+    comfy_timeout: float = float(os.getenv("COMFY_TIMEOUT", "600"))
+    comfy_websocket: bool = os.getenv("COMFY_WEBSOCKET", "true").lower() == "true"
+    # Render pool ("comfy-pool" adapter): comma-separated ComfyUI base URLs
+    comfy_pool: list[str] = [u.strip() for u in os.getenv("COMFY_POOL", "").split(",") if u.strip()]
+    comfy_pool_health_interval: float = float(os.getenv("COMFY_POOL_HEALTH_INTERVAL", "15"))
+    comfy_pool_eject_seconds: float = float(os.getenv("COMFY_POOL_EJECT_SECONDS", "30"))
 
 
 settings = Settings()
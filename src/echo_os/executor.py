@@ -25,3 +25,12 @@ async def upsert_tasks(project_id: int, titles: list[str]) -> list[Task]:
             created.append(task)
         await s.flush()
     return created
+
+
+async def add_task(project_id: int, title: str) -> Task:
+    """Insert and commit a single task (streamed plans persist as they go)"""
+    async with session_scope() as s:
+        task = Task(project_id=project_id, title=title)
+        s.add(task)
+        await s.flush()
+    return task
@@ -0,0 +1,176 @@
+"""LLM response cache — SQLite-backed, TTL + size bounded, single-flight"""
+
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import select
+from .config import settings
+
+
+def cache_key(model: str, messages: Any, temperature: float, **params: Any) -> str:
+    """Stable hash of everything that shapes a completion"""
+    blob = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature, **params},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class LLMCache:
+    """Memoize completions in the LLMResponse table.
+
+    Identical concurrent requests share one upstream call: the first caller
+    becomes the leader, later ones await its result (single-flight). Entries
+    expire after `llm_cache_ttl` seconds; beyond `llm_cache_max_entries` the
+    least recently used rows are evicted.
+    """
+
+    PRUNE_EVERY = 64  # stores between size checks
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stores = 0
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0, "evicted": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.llm_cache_ttl > 0
+
+    async def _get(self, key: str) -> Optional[str]:
+        from .models import LLMResponse
+        from .store import session_scope
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.llm_cache_ttl)
+        async with session_scope() as s:
+            row = (
+                await s.exec(
+                    select(LLMResponse).where(
+                        LLMResponse.key == key, LLMResponse.created_at >= cutoff
+                    )
+                )
+            ).first()
+            if row is None:
+                return None
+            row.hits += 1
+            row.last_used_at = datetime.utcnow()
+            return row.response
+
+    async def _put(self, key: str, model: str, response: str) -> None:
+        from .models import LLMResponse
+        from .store import session_scope
+
+        now = datetime.utcnow()
+        stmt = insert(LLMResponse).values(
+            key=key, model=model, response=response, hits=0, created_at=now, last_used_at=now
+        )
+        async with session_scope() as s:
+            await s.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["key"],
+                    set_={"response": response, "created_at": now, "last_used_at": now},
+                )
+            )
+        self._stores += 1
+        if self._stores % self.PRUNE_EVERY == 1:
+            await self.prune()
+
+    async def prune(self) -> int:
+        """Drop expired rows, then least recently used rows over the size bound"""
+        from .models import LLMResponse
+        from .store import session_scope
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.llm_cache_ttl)
+        async with session_scope() as s:
+            res = await s.execute(delete(LLMResponse).where(LLMResponse.created_at < cutoff))
+            removed = res.rowcount or 0
+            count = (await s.exec(select(func.count()).select_from(LLMResponse))).one()
+            excess = count - settings.llm_cache_max_entries
+            if excess > 0:
+                oldest = (
+                    select(LLMResponse.id)
+                    .order_by(LLMResponse.last_used_at)
+                    .limit(excess)
+                    .scalar_subquery()
+                )
+                res = await s.execute(delete(LLMResponse).where(LLMResponse.id.in_(oldest)))
+                removed += res.rowcount or 0
+        self.stats["evicted"] += removed
+        return removed
+
+    async def _read(self, key: str) -> Optional[str]:
+        try:
+            cached = await self._get(key)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"⚠️  LLM cache read failed: {e}")
+            cached = None
+        self.stats["hits" if cached is not None else "misses"] += 1
+        return cached
+
+    async def store(self, key: str, model: str, response: str) -> None:
+        try:
+            await self._put(key, model, response)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"⚠️  LLM cache write failed: {e}")
+
+    async def lookup(self, key: str) -> Optional[str]:
+        """Cached (or in-flight) response, else None; for callers that fetch themselves"""
+        if (leader := self._inflight.get(key)) is not None:
+            self.stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(leader)
+            except Exception:
+                pass  # the leader failed: let the caller try
+        return await self._read(key)
+
+    async def get_or_fetch(
+        self, key: str, model: str, fetch: Callable[[], Awaitable[str]]
+    ) -> str:
+        if (leader := self._inflight.get(key)) is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(leader)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await self._read(key)
+            if result is None:
+                result = await fetch()
+                await self.store(key, model, result)
+            fut.set_result(result)
+            return result
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                fut.cancel()
+            else:
+                fut.set_exception(e)
+                fut.exception()  # followers re-raise it; don't warn if there are none
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def snapshot(self) -> Dict[str, Any]:
+        from .models import LLMResponse
+        from .store import read_scope
+
+        async with read_scope() as s:
+            entries = (await s.exec(select(func.count()).select_from(LLMResponse))).one()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else None,
+            "in_flight": len(self._inflight),
+            "entries": entries,
+            "max_entries": settings.llm_cache_max_entries,
+            "ttl_seconds": settings.llm_cache_ttl,
+        }
+
+
+llm_cache = LLMCache()
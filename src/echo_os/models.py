@@ -2,6 +2,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 from enum import Enum
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
@@ -25,6 +26,8 @@ class Priority(str, Enum):
 
 
 class EchoLog(SQLModel, table=True):
+    __table_args__ = (Index("ix_echolog_created_at_id", "created_at", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     code: str = Field(index=True)
     title: str
@@ -41,6 +44,11 @@ class Project(SQLModel, table=True):
 
 
 class Task(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_task_created_at_id", "created_at", "id"),
+        Index("ix_task_project_created_at_id", "project_id", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     project_id: int = Field(foreign_key="project.id", index=True)
     title: str
@@ -52,9 +60,56 @@ class Task(SQLModel, table=True):
 
 
 class Artifact(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_artifact_project_adapter_created_at", "project", "adapter", "created_at"),
+        Index("ix_artifact_kind_created_at", "kind", "created_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    task_id: int = Field(foreign_key="task.id", index=True)
+    task_id: Optional[int] = Field(default=None, foreign_key="task.id", index=True)
+    project: str = ""
+    adapter: str = ""
     kind: str
     path: str
+    size: int = 0
+    sha256: str = Field(default="", index=True)
+    prompt_hash: str = ""
+    duration_ms: Optional[float] = None
     meta: str = ""
     created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ScenePrompt(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    story: str
+    slug: str = Field(index=True)
+    scene_id: str
+    idx: int
+    prompt: str
+    modulated_prompt: str = ""
+    prompt_hash: str = ""
+    freq_profile_id: str = ""
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class StoryBible(SQLModel, table=True):
+    """Cached LLM story bibles, keyed by a hash of the title + scene prompts"""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    key: str = Field(index=True, unique=True)
+    story: str
+    model: str = ""
+    data: str  # JSON
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class LLMResponse(SQLModel, table=True):
+    """Cached chat completions (see llm_cache.py)"""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    key: str = Field(index=True, unique=True)
+    model: str
+    response: str
+    hits: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_used_at: datetime = Field(default_factory=datetime.utcnow, index=True)
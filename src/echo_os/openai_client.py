@@ -1,14 +1,33 @@
 from __future__ import annotations
 import asyncio
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from openai import AsyncOpenAI, APIError, APITimeoutError, RateLimitError
 from .config import settings
+from .llm_cache import cache_key, llm_cache
 
-client = AsyncOpenAI(
-    api_key=settings.openai_api_key,
-    organization=settings.openai_org,
-    project=settings.openai_project,
-)
+_client: Optional[AsyncOpenAI] = None
+
+TEMPERATURE = 0.2
+MAX_TASKS = 10
+
+
+def get_client() -> AsyncOpenAI:
+    """Shared AsyncOpenAI client, created on first use (so imports need no key)"""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            organization=settings.openai_org,
+            project=settings.openai_project,
+            base_url=settings.openai_base_url,
+        )
+    return _client
+
+
+def set_client(client: Optional[AsyncOpenAI]) -> None:
+    """Swap the shared client (e.g. one pointed at a fake server); None resets"""
+    global _client
+    _client = client
 
 
 async def _retry(coro_fn, *args, retries=3, base=0.5, **kwargs):
@@ -21,26 +40,96 @@ async def _retry(coro_fn, *args, retries=3, base=0.5, **kwargs):
             await asyncio.sleep(base * (2**i))
 
 
-async def chat(messages: List[Dict], model: Optional[str] = None) -> str:
+async def chat(
+    messages: List[Dict],
+    model: Optional[str] = None,
+    response_format: Optional[Dict] = None,
+    cache: bool = True,
+) -> str:
+    """Completion text; cached and coalesced per (model, messages, temperature, format)"""
+    model = model or settings.model
+    extra = {"response_format": response_format} if response_format else {}
+
+    async def fetch() -> str:
+        resp = await _retry(
+            get_client().chat.completions.create,
+            model=model,
+            messages=messages,
+            temperature=TEMPERATURE,
+            timeout=30,
+            **extra,
+        )
+        return resp.choices[0].message.content or ""
+
+    if not (cache and llm_cache.enabled):
+        return await fetch()
+    key = cache_key(model, messages, TEMPERATURE, **extra)
+    return await llm_cache.get_or_fetch(key, model, fetch)
+
+
+async def chat_stream(
+    messages: List[Dict], model: Optional[str] = None, cache: bool = True
+) -> AsyncIterator[str]:
+    """Yield completion text as it arrives; a cache hit is yielded in one piece.
+
+    Shares cache entries with chat(), and stores the full text once the stream
+    completes. Not single-flighted: a stream already running is not shared,
+    though a finished or in-flight chat() result is reused.
+    """
     model = model or settings.model
-    resp = await _retry(
-        client.chat.completions.create,
+    key = cache_key(model, messages, TEMPERATURE)
+    use_cache = cache and llm_cache.enabled
+    if use_cache and (cached := await llm_cache.lookup(key)) is not None:
+        yield cached
+        return
+
+    stream = await _retry(
+        get_client().chat.completions.create,
         model=model,
         messages=messages,
-        temperature=0.2,
+        temperature=TEMPERATURE,
         timeout=30,
+        stream=True,
     )
-    return resp.choices[0].message.content or ""
+    parts: List[str] = []
+    async for chunk in stream:
+        if chunk.choices and (delta := chunk.choices[0].delta.content):
+            parts.append(delta)
+            yield delta
+    if use_cache:
+        await llm_cache.store(key, model, "".join(parts))
 
 
-async def suggest_tasks(context: str, project_name: str) -> list[str]:
-    prompt = [
+def _task_messages(context: str, project_name: str) -> List[Dict]:
+    return [
         {
             "role": "system",
             "content": "You are Echo. Output 3-7 atomic tasks, one per line, no numbering.",
         },
         {"role": "user", "content": f"Project: {project_name}\nContext:\n{context}"},
     ]
-    text = await chat(prompt)
-    lines = [line.strip("-•\t ") for line in text.splitlines() if line.strip()]
-    return [line for line in lines if len(line) > 3][:10]
+
+
+def _task_title(line: str) -> Optional[str]:
+    line = line.strip().strip("-•\t ")
+    return line if len(line) > 3 else None
+
+
+async def suggest_tasks(context: str, project_name: str) -> list[str]:
+    text = await chat(_task_messages(context, project_name))
+    titles = (_task_title(line) for line in text.splitlines())
+    return [t for t in titles if t][:MAX_TASKS]
+
+
+async def suggest_tasks_stream(context: str, project_name: str) -> AsyncIterator[str]:
+    """Yield each task title as soon as its line is complete"""
+    buf, count = "", 0
+    async for delta in chat_stream(_task_messages(context, project_name)):
+        buf += delta
+        *lines, buf = buf.split("\n")
+        for line in lines:
+            if (title := _task_title(line)) and count < MAX_TASKS:
+                count += 1
+                yield title
+    if (title := _task_title(buf)) and count < MAX_TASKS:
+        yield title
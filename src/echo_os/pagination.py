@@ -0,0 +1,38 @@
+"""Keyset pagination helpers — opaque (created_at, id) cursors"""
+
+from __future__ import annotations
+import base64
+from datetime import datetime
+from typing import Any, Callable, Sequence
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception:
+        raise HTTPException(400, "invalid cursor")
+
+
+def keyset(stmt, created_col, id_col, cursor: str | None, limit: int):
+    """Newest-first page after `cursor`; fetches one extra row to detect the next page"""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return stmt.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def page(
+    rows: Sequence[Any], limit: int, key: Callable[[Any], tuple[datetime, int]]
+) -> tuple[list[Any], str | None]:
+    items = list(rows[:limit])
+    next_cursor = encode_cursor(*key(items[-1])) if len(rows) > limit else None
+    return items, next_cursor
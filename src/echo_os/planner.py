@@ -1,6 +1,11 @@
 from __future__ import annotations
-from .openai_client import suggest_tasks
+from typing import AsyncIterator
+from .openai_client import suggest_tasks, suggest_tasks_stream
 
 
 async def plan_from_intent(project: str, context: str) -> list[str]:
     return await suggest_tasks(context=context, project_name=project)
+
+
+def plan_stream_from_intent(project: str, context: str) -> AsyncIterator[str]:
+    return suggest_tasks_stream(context=context, project_name=project)
@@ -0,0 +1,22 @@
+"""Render adapter catalogue — capabilities and cached health"""
+
+from __future__ import annotations
+import asyncio
+from fastapi import APIRouter, HTTPException
+from ..adapters.render import adapter_names, describe_adapter
+
+router = APIRouter()
+
+
+@router.get("")
+async def list_adapters(refresh: bool = False):
+    """Every registered adapter; health probes run concurrently and are cached"""
+    items = await asyncio.gather(*(describe_adapter(n, refresh) for n in adapter_names()))
+    return {"items": list(items)}
+
+
+@router.get("/{name}")
+async def get_adapter_info(name: str, refresh: bool = False):
+    if name not in adapter_names():
+        raise HTTPException(404, f"adapter not found: {name}")
+    return await describe_adapter(name, refresh)
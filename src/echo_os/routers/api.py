@@ -1,12 +1,19 @@
 from __future__ import annotations
-from fastapi import APIRouter, HTTPException
+import json
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlmodel import select
-from ..store import session_scope, init_db
-from ..executor import ensure_project, upsert_tasks
-from ..planner import plan_from_intent
+from ..store import session_scope, read_scope, init_db
+from ..executor import add_task, ensure_project, upsert_tasks
+from ..planner import plan_from_intent, plan_stream_from_intent
 from ..models import EchoLog, Project, Task, TaskStatus, Priority
+from ..pagination import keyset, page
+from ..bulk import bulk_insert, iter_bulk_body
+from ..llm_cache import llm_cache
 from . import render as render_router
+from . import search as search_router
+from . import artifacts as artifacts_router
 
 router = APIRouter()
 
@@ -25,6 +32,42 @@ async def plan(req: PlanRequest):
     return {"project_id": proj.id, "tasks": [t.title for t in tasks]}
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/plan/stream")
+async def plan_stream(req: PlanRequest):
+    """Server-sent events: one `task` event per task as soon as it is stored,
+    then `done` (or `error`)"""
+    await init_db()
+    proj = await ensure_project(req.project)
+
+    async def events():
+        ids = []
+        try:
+            async for title in plan_stream_from_intent(project=req.project, context=req.context):
+                task = await add_task(proj.id, title)
+                ids.append(task.id)
+                yield _sse("task", {"id": task.id, "title": task.title})
+        except Exception as e:
+            yield _sse("error", {"error": str(e), "task_ids": ids})
+            return
+        yield _sse("done", {"project_id": proj.id, "task_ids": ids})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/llm/cache")
+async def llm_cache_stats():
+    """Hit/miss/coalesced counters (since start) and current cache size"""
+    return await llm_cache.snapshot()
+
+
 # ---- EchoLog
 class LogIn(BaseModel):
     code: str
@@ -41,25 +84,31 @@ async def create_log(data: LogIn):
         return {"id": log.id, "code": log.code}
 
 
+@router.post("/log/bulk")
+async def create_logs_bulk(request: Request):
+    """Ingest a JSON array or NDJSON stream of log entries"""
+    ids = await bulk_insert(EchoLog, iter_bulk_body(request, LogIn))
+    return {"count": len(ids), "ids": ids}
+
+
 @router.get("/log")
-async def list_logs(limit: int = 20, offset: int = 0):
-    async with session_scope() as s:
-        res = await s.exec(
-            select(EchoLog)
-            .order_by(EchoLog.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-        )
-        items = res.all()
-        return [
-            {
-                "id": x.id,
-                "code": x.code,
-                "title": x.title,
-                "created_at": x.created_at.isoformat(),
-            }
-            for x in items
-        ]
+async def list_logs(limit: int = Query(20, ge=1, le=500), cursor: str | None = None):
+    async with read_scope() as s:
+        stmt = select(EchoLog.id, EchoLog.code, EchoLog.title, EchoLog.created_at)
+        res = await s.exec(keyset(stmt, EchoLog.created_at, EchoLog.id, cursor, limit))
+        items, next_cursor = page(res.all(), limit, key=lambda x: (x.created_at, x.id))
+        return {
+            "items": [
+                {
+                    "id": x.id,
+                    "code": x.code,
+                    "title": x.title,
+                    "created_at": x.created_at.isoformat(),
+                }
+                for x in items
+            ],
+            "next_cursor": next_cursor,
+        }
 
 
 # ---- Projects
@@ -79,7 +128,7 @@ async def create_project(p: ProjectIn):
 
 @router.get("/project")
 async def list_projects():
-    async with session_scope() as s:
+    async with read_scope() as s:
         res = await s.exec(select(Project).order_by(Project.created_at.desc()))
         return [{"id": p.id, "name": p.name, "status": p.status} for p in res.all()]
 
@@ -106,6 +155,13 @@ async def create_task(t: TaskIn):
         return {"id": task.id, "title": task.title}
 
 
+@router.post("/task/bulk")
+async def create_tasks_bulk(request: Request):
+    """Ingest a JSON array or NDJSON stream of tasks"""
+    ids = await bulk_insert(Task, iter_bulk_body(request, TaskIn))
+    return {"count": len(ids), "ids": ids}
+
+
 class TaskPatch(BaseModel):
     status: TaskStatus | None = None
     title: str | None = None
@@ -126,23 +182,34 @@ async def patch_task(task_id: int, data: TaskPatch):
 
 
 @router.get("/task")
-async def list_tasks(project_id: int | None = None):
-    async with session_scope() as s:
-        stmt = select(Task).order_by(Task.created_at.desc())
+async def list_tasks(
+    project_id: int | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+):
+    async with read_scope() as s:
+        stmt = select(Task)
         if project_id:
             stmt = stmt.where(Task.project_id == project_id)
-        res = await s.exec(stmt)
-        return [
-            {
-                "id": t.id,
-                "project_id": t.project_id,
-                "title": t.title,
-                "status": t.status,
-                "priority": t.priority,
-            }
-            for t in res.all()
-        ]
-
-
-# Include render router
+        res = await s.exec(keyset(stmt, Task.created_at, Task.id, cursor, limit))
+        items, next_cursor = page(res.all(), limit, key=lambda t: (t.created_at, t.id))
+        return {
+            "items": [
+                {
+                    "id": t.id,
+                    "project_id": t.project_id,
+                    "title": t.title,
+                    "status": t.status,
+                    "priority": t.priority,
+                    "created_at": t.created_at.isoformat(),
+                }
+                for t in items
+            ],
+            "next_cursor": next_cursor,
+        }
+
+
+# Include render, search and artifact routers
 router.include_router(render_router.router, prefix="")
+router.include_router(search_router.router, prefix="")
+router.include_router(artifacts_router.router, prefix="")
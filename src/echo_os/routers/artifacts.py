@@ -0,0 +1,72 @@
+"""Artifact registry query endpoints"""
+
+from __future__ import annotations
+import json
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from sqlmodel import select
+from ..store import read_scope
+from ..models import Artifact
+from ..pagination import keyset, page
+from ..artifacts.storage import _slugify
+
+router = APIRouter()
+
+
+def _artifact_out(a: Artifact) -> dict:
+    return {
+        "id": a.id,
+        "project": a.project,
+        "adapter": a.adapter,
+        "kind": a.kind,
+        "path": a.path,
+        "size": a.size,
+        "sha256": a.sha256,
+        "prompt_hash": a.prompt_hash,
+        "duration_ms": a.duration_ms,
+        "task_id": a.task_id,
+        "meta": json.loads(a.meta) if a.meta else {},
+        "created_at": a.created_at.isoformat(),
+    }
+
+
+@router.get("/artifacts")
+async def list_artifacts(
+    project: Optional[str] = None,
+    adapter: Optional[str] = None,
+    kind: Optional[str] = None,
+    sha256: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+):
+    """Newest-first artifacts; project/adapter/kind + time range hit composite indexes"""
+    stmt = select(Artifact)
+    if project:
+        stmt = stmt.where(Artifact.project == (_slugify(project) or "echo"))
+    if adapter:
+        stmt = stmt.where(Artifact.adapter == adapter)
+    if kind:
+        stmt = stmt.where(Artifact.kind == kind)
+    if sha256:
+        stmt = stmt.where(Artifact.sha256 == sha256)
+    if since:
+        stmt = stmt.where(Artifact.created_at >= since)
+    if until:
+        stmt = stmt.where(Artifact.created_at < until)
+
+    async with read_scope() as s:
+        res = await s.exec(keyset(stmt, Artifact.created_at, Artifact.id, cursor, limit))
+        items, next_cursor = page(res.all(), limit, key=lambda a: (a.created_at, a.id))
+    return {"items": [_artifact_out(a) for a in items], "next_cursor": next_cursor}
+
+
+@router.get("/artifacts/{artifact_id}")
+async def get_artifact(artifact_id: int):
+    async with read_scope() as s:
+        a = await s.get(Artifact, artifact_id)
+    if not a:
+        raise HTTPException(404, "artifact not found")
+    return _artifact_out(a)
@@ -1,13 +1,25 @@
 """Instagram Captions & Hashtags Generator"""
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any
-import json
-from pathlib import Path
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional
+import asyncio
+
+from ..artifacts.registry import register_artifact
+from ..artifacts.storage import atomic_write_bytes
+from ..artifacts.stories import StoryRef, find_story, scan_stories
+from ..utils.hashtags import fit_hashtags, load_rules
 
 router = APIRouter()
 
+# Default caption budgets per platform (overridable per request)
+PLATFORM_MAX_CHARS = {
+    "instagram": 2200,
+    "tiktok": 2200,
+    "youtube": 5000,
+    "x": 280,
+}
+
 
 class CaptionRequest(BaseModel):
     slug: str
@@ -19,30 +31,31 @@ class CaptionRequest(BaseModel):
     story_context: Dict[str, Any] = None
 
 
-def load_story_meta(slug: str) -> Dict[str, Any]:
-    """Load story metadata from artifacts"""
-    # Find the story directory
-    artifacts_dir = Path("artifacts")
-    story_dir = None
-
-    for date_dir in artifacts_dir.iterdir():
-        if date_dir.is_dir():
-            for story_subdir in date_dir.iterdir():
-                if story_subdir.is_dir() and slug in story_subdir.name:
-                    story_dir = story_subdir
-                    break
-        if story_dir:
-            break
-
-    if not story_dir or not story_dir.exists():
+class CaptionBatchRequest(BaseModel):
+    slugs: Optional[List[str]] = None  # None = every story in the index
+    platforms: List[str] = ["instagram"]
+    max_chars: Optional[int] = None  # default: PLATFORM_MAX_CHARS
+    include_hashtags: bool = True
+    include_story_beats: bool = True
+    include_tech_specs: bool = False
+    story_context: Dict[str, Any] = None
+    concurrency: int = Field(8, ge=1, le=64)
+
+
+def caption_filename(platform: str) -> str:
+    return f"{platform}_caption.txt"
+
+
+def find_story_or_404(slug: str) -> StoryRef:
+    story = find_story(slug)
+    if story is None:
         raise HTTPException(404, f"Story not found: {slug}")
+    return story
 
-    meta_file = story_dir / "meta.json"
-    if not meta_file.exists():
-        raise HTTPException(404, f"Meta file not found for: {slug}")
 
-    with open(meta_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+def load_story_meta(slug: str) -> Dict[str, Any]:
+    """Load story metadata from artifacts"""
+    return find_story_or_404(slug).load_meta()
 
 
 def generate_story_beats(scenes: List[Dict]) -> List[str]:
@@ -81,50 +94,7 @@ def generate_tech_specs(meta: Dict) -> str:
 
 def generate_hashtags(meta: Dict, story_beats: List[str]) -> List[str]:
     """Generate relevant hashtags"""
-    hashtags = set()
-
-    # Add existing hashtags from meta
-    if "hashtags" in meta:
-        hashtags.update(meta["hashtags"])
-
-    # Add story-specific hashtags
-    story_title = meta.get("story", "").lower()
-    if "cyberpunk" in story_title:
-        hashtags.update(["#Cyberpunk", "#Neon", "#Futuristic", "#TechNoir"])
-    if "dreams" in story_title:
-        hashtags.update(["#DigitalDreams", "#VirtualReality", "#AIDreams"])
-    if "gölge" in story_title or "protokol" in story_title:
-        hashtags.update(["#GölgeProtokolü", "#DigitalSpirituality", "#CodeAsFaith"])
-
-    # Add scene-based hashtags
-    for beat in story_beats:
-        if "neon" in beat.lower():
-            hashtags.add("#NeonAesthetic")
-        if "data" in beat.lower():
-            hashtags.add("#DataArt")
-        if "neural" in beat.lower():
-            hashtags.add("#NeuralInterface")
-        if "virtual" in beat.lower():
-            hashtags.add("#VirtualReality")
-        if "digital" in beat.lower():
-            hashtags.add("#DigitalArt")
-        if "awakening" in beat.lower():
-            hashtags.add("#DigitalAwakening")
-
-    # Add general ECHO.OS hashtags
-    hashtags.update(
-        [
-            "#ECHOOS",
-            "#VisualStory",
-            "#Cinematic",
-            "#AIArt",
-            "#DigitalStorytelling",
-            "#CyberpunkArt",
-            "#NeonAesthetic",
-        ]
-    )
-
-    return sorted(list(hashtags))
+    return load_rules().hashtags(meta, story_beats)
 
 
 def generate_caption(
@@ -134,6 +104,7 @@ def generate_caption(
     hashtags: List[str],
     max_chars: int,
     story_context: Dict = None,
+    platform: str = "instagram",
 ) -> str:
     """Generate Instagram caption with character limit"""
 
@@ -218,34 +189,9 @@ def generate_caption(
         )  # -2 for newlines
 
         # Select most relevant hashtags
-        priority_hashtags = [
-            "#ECHOOS",
-            "#VisualStory",
-            "#Cinematic",
-            "#Cyberpunk",
-            "#DigitalArt",
-            "#NeonAesthetic",
-            "#AIDreams",
-            "#DigitalSpirituality",
-        ]
-
-        selected_hashtags = []
-        current_length = 0
-
-        # Add priority hashtags first
-        for tag in priority_hashtags:
-            if current_length + len(tag) + 1 <= available_chars:
-                selected_hashtags.append(tag)
-                current_length += len(tag) + 1
-
-        # Add remaining hashtags if space allows
-        remaining_hashtags = [tag for tag in hashtags if tag not in priority_hashtags]
-        for tag in remaining_hashtags:
-            if current_length + len(tag) + 1 <= available_chars:
-                selected_hashtags.append(tag)
-                current_length += len(tag) + 1
-            else:
-                break
+        selected_hashtags = fit_hashtags(
+            hashtags, available_chars, load_rules().priority(platform)
+        )
 
         full_caption = (
             main_content + "\n" + hashtag_section + "\n" + " ".join(selected_hashtags)
@@ -254,54 +200,61 @@ def generate_caption(
     return full_caption
 
 
+def build_caption(
+    meta: Dict[str, Any],
+    max_chars: int,
+    include_hashtags: bool = True,
+    include_tech_specs: bool = False,
+    story_context: Dict[str, Any] = None,
+    platform: str = "instagram",
+) -> Dict[str, Any]:
+    """Caption, hashtags and story beats for one story/platform"""
+    # Generate story beats from scenes
+    story_beats = generate_story_beats(meta.get("scenes", []))
+
+    # Generate tech specs if requested
+    tech_specs = generate_tech_specs(meta) if include_tech_specs else ""
+
+    # Generate hashtags
+    hashtags = generate_hashtags(meta, story_beats) if include_hashtags else []
+
+    caption = generate_caption(
+        meta, story_beats, tech_specs, hashtags, max_chars, story_context, platform
+    )
+    return {"caption": caption, "hashtags": hashtags, "story_beats": story_beats}
+
+
+def write_caption(story: StoryRef, platform: str, caption: str):
+    return atomic_write_bytes(story.dir / caption_filename(platform), caption.encode("utf-8"))
+
+
+def _register_caption(story: StoryRef, platform: str, path) -> None:
+    register_artifact(
+        path, adapter="captions", project=story.slug, kind="caption", platform=platform
+    )
+
+
 @router.post("/generate")
 async def generate_captions(request: CaptionRequest):
     """Generate Instagram captions and hashtags for a story"""
     try:
-        # Load story metadata
-        meta = load_story_meta(request.slug)
-
-        # Generate story beats from scenes
-        scenes = meta.get("scenes", [])
-        story_beats = generate_story_beats(scenes)
+        story = find_story_or_404(request.slug)
+        meta = story.load_meta()
 
-        # Generate tech specs if requested
-        tech_specs = ""
-        if request.include_tech_specs:
-            tech_specs = generate_tech_specs(meta)
-
-        # Generate hashtags
-        hashtags = []
-        if request.include_hashtags:
-            hashtags = generate_hashtags(meta, story_beats)
-
-        # Generate caption
-        caption = generate_caption(
+        built = build_caption(
             meta,
-            story_beats,
-            tech_specs,
-            hashtags,
             request.max_chars,
+            request.include_hashtags,
+            request.include_tech_specs,
             request.story_context,
+            request.platform,
         )
+        caption, hashtags = built["caption"], built["hashtags"]
 
-        # Save caption to file
-        artifacts_dir = Path("artifacts")
-        story_dir = None
-
-        for date_dir in artifacts_dir.iterdir():
-            if date_dir.is_dir():
-                for story_subdir in date_dir.iterdir():
-                    if story_subdir.is_dir() and request.slug in story_subdir.name:
-                        story_dir = story_subdir
-                        break
-            if story_dir:
-                break
-
-        if story_dir:
-            caption_file = story_dir / "instagram_caption.txt"
-            with open(caption_file, "w", encoding="utf-8") as f:
-                f.write(caption)
+        caption_file = await asyncio.to_thread(
+            write_caption, story, request.platform, caption
+        )
+        _register_caption(story, request.platform, caption_file)
 
         return {
             "ok": True,
@@ -310,37 +263,90 @@ async def generate_captions(request: CaptionRequest):
             "caption_length": len(caption),
             "max_chars": request.max_chars,
             "hashtag_count": len(hashtags),
-            "story_beats_count": len(story_beats),
+            "story_beats_count": len(built["story_beats"]),
             "caption": caption,
             "hashtags": hashtags,
-            "saved_to": str(caption_file) if story_dir else None,
+            "saved_to": str(caption_file),
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Caption generation failed: {str(e)}")
 
 
+def _caption_story(story: StoryRef, request: CaptionBatchRequest) -> List[Dict[str, Any]]:
+    """All requested platforms for one story; meta is read once"""
+    meta = story.load_meta()
+    results = []
+    for platform in request.platforms:
+        max_chars = request.max_chars or PLATFORM_MAX_CHARS.get(platform, 2200)
+        built = build_caption(
+            meta,
+            max_chars,
+            request.include_hashtags,
+            request.include_tech_specs,
+            request.story_context,
+            platform,
+        )
+        path = write_caption(story, platform, built["caption"])
+        results.append(
+            {
+                "ok": True,
+                "slug": story.slug,
+                "date": story.date,
+                "platform": platform,
+                "caption_length": len(built["caption"]),
+                "max_chars": max_chars,
+                "hashtag_count": len(built["hashtags"]),
+                "saved_to": str(path),
+            }
+        )
+    return results
+
+
+@router.post("/batch")
+async def generate_batch_captions(request: CaptionBatchRequest):
+    """Caption many stories × platforms from a single scan of the story index"""
+    stories = scan_stories()
+    if request.slugs is not None:
+        wanted, missing = [], []
+        for slug in dict.fromkeys(request.slugs):
+            story = find_story(slug, stories)
+            (wanted.append(story) if story else missing.append(slug))
+        stories = list(dict.fromkeys(wanted))
+    else:
+        missing = []
+
+    semaphore = asyncio.Semaphore(request.concurrency)
+
+    async def run(story: StoryRef) -> List[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                results = await asyncio.to_thread(_caption_story, story, request)
+            except Exception as e:
+                return [{"ok": False, "slug": story.slug, "date": story.date, "error": str(e)}]
+        # The registry queue lives on the event loop, so register from here
+        for r in results:
+            _register_caption(story, r["platform"], r["saved_to"])
+        return results
+
+    results = [r for batch in await asyncio.gather(*(run(s) for s in stories)) for r in batch]
+    results += [{"ok": False, "slug": slug, "error": "Story not found"} for slug in missing]
+    return {
+        "ok": True,
+        "total": len(results),
+        "successful": len([r for r in results if r["ok"]]),
+        "failed": len([r for r in results if not r["ok"]]),
+        "results": results,
+    }
+
+
 @router.get("/{slug}")
-async def get_captions(slug: str):
+async def get_captions(slug: str, platform: str = "instagram"):
     """Get existing captions for a story"""
     try:
-        # Find story directory
-        artifacts_dir = Path("artifacts")
-        story_dir = None
-
-        for date_dir in artifacts_dir.iterdir():
-            if date_dir.is_dir():
-                for story_subdir in date_dir.iterdir():
-                    if story_subdir.is_dir() and slug in story_subdir.name:
-                        story_dir = story_subdir
-                        break
-            if story_dir:
-                break
-
-        if not story_dir:
-            raise HTTPException(404, f"Story not found: {slug}")
-
-        caption_file = story_dir / "instagram_caption.txt"
+        caption_file = find_story_or_404(slug).dir / caption_filename(platform)
         if not caption_file.exists():
             raise HTTPException(404, f"No captions found for: {slug}")
 
@@ -350,6 +356,7 @@ async def get_captions(slug: str):
         return {
             "ok": True,
             "slug": slug,
+            "platform": platform,
             "caption": caption,
             "caption_length": len(caption),
         }
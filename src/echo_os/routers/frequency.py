@@ -0,0 +1,93 @@
+"""Frequency profile endpoints — served from the in-memory profile index"""
+
+from __future__ import annotations
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Body, HTTPException
+from pydantic import BaseModel, Field
+from ..adapters.resonance import (
+    ProfileEntry,
+    compose_frequency,
+    create_frequency_snapshot,
+    diff_profiles,
+    profiles,
+    validate_profile,
+)
+
+router = APIRouter()
+
+
+class SnapshotIn(BaseModel):
+    user: str = Field("api", pattern=r"^[\w-]{1,32}$")  # becomes part of the file name
+    overrides: Optional[Dict[str, Any]] = None
+
+
+def _entry_out(entry: ProfileEntry) -> dict:
+    return {**entry.summary(), "profile": entry.profile}
+
+
+def _lookup(name: str) -> ProfileEntry:
+    entry = profiles.snapshot(name) or profiles.entry(name)
+    if entry is None:
+        raise HTTPException(404, f"frequency profile not found: {name}")
+    if entry.errors:
+        raise HTTPException(422, {"name": name, "errors": entry.errors})
+    return entry
+
+
+@router.get("")
+async def list_profiles():
+    return {
+        "items": [e.summary() for e in profiles.entries()],
+        "watching": profiles.watching,
+    }
+
+
+@router.get("/snapshots")
+async def list_snapshots():
+    items = sorted(
+        (e.summary() for e in profiles.snapshots()),
+        key=lambda s: s["created_at"] or s["modified_at"],
+        reverse=True,
+    )
+    return {"items": items}
+
+
+@router.get("/snapshots/{snapshot_id}")
+async def get_snapshot(snapshot_id: str):
+    entry = profiles.snapshot(snapshot_id)
+    if entry is None:
+        raise HTTPException(404, f"snapshot not found: {snapshot_id}")
+    return _entry_out(entry)
+
+
+@router.get("/diff")
+async def diff(a: str, b: str):
+    """Changes from `a` to `b` (snapshot ids or profile names); id/created_* are ignored"""
+    pa, pb = _lookup(a).profile, _lookup(b).profile
+    return {"a": pa.get("id", a), "b": pb.get("id", b), "changes": diff_profiles(pa, pb)}
+
+
+@router.post("/validate")
+async def validate(profile: Dict[str, Any] = Body(...)):
+    errors = validate_profile(profile)
+    return {"valid": not errors, "errors": errors}
+
+
+@router.get("/{name}")
+async def get_profile(name: str):
+    entry = profiles.entry(name)
+    if entry is None:
+        raise HTTPException(404, f"frequency profile not found: {name}")
+    return _entry_out(entry)
+
+
+@router.post("/{name}/snapshot")
+async def snapshot(name: str, body: Optional[SnapshotIn] = None):
+    """Freeze a profile (plus optional overrides) into frequency/snapshots/"""
+    body = body or SnapshotIn()
+    profile = compose_frequency(_lookup(name).profile, body.overrides)
+    if errors := validate_profile(profile):
+        raise HTTPException(422, {"name": name, "errors": errors})
+    snapshot_id = create_frequency_snapshot(profile, body.user)
+    profiles.refresh()  # read-your-writes, without waiting for the watcher
+    return _entry_out(profiles.snapshot(snapshot_id))
@@ -1,20 +1,27 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
+import asyncio
 import json
-import os
 import csv
 import hashlib
+import shutil
 from datetime import datetime
 from pathlib import Path
 
 from ..adapters.resonance import (
     compose_frequency,
+    compile_bible,
     modulate_prompt,
-    load_default_profile,
+    profiles,
 )
 from ..adapters.render import get_adapter
+from ..artifacts import cas
+from ..artifacts.registry import register_artifact
+from ..artifacts.storage import move_file
 from ..utils.bible_renderer import render_bible
+from ..models import ScenePrompt
+from ..store import session_scope
 
 router = APIRouter()
 
@@ -38,17 +45,10 @@ async def _ninegrid(
 ):
     """Generate 9-grid story with Dynamic Frequency System and Bible integration"""
 
-    # Load base frequency profile
-    if freq_profile:
-        # Load from frequency file
-        freq_file = f"frequency/{freq_profile}.json"
-        if os.path.exists(freq_file):
-            with open(freq_file, "r") as f:
-                base_profile = json.load(f)
-        else:
-            base_profile = load_default_profile()
-    else:
-        base_profile = load_default_profile()
+    # Load base frequency profile (cached until the file changes) and apply
+    # the story override once; scenes only recompose when they override too
+    base_profile = profiles.resolve(freq_profile)
+    story_freq = compose_frequency(base_profile, freq_story_override)
 
     # Load CSV scenes
     scenes = []
@@ -63,6 +63,7 @@ async def _ninegrid(
     except Exception as e:
         print(f"Bible generation failed: {e}")
         bible_data = {}
+    bible_suffix = compile_bible(bible_data)
 
     # Create story directory
     timestamp = datetime.now().strftime("%Y-%m-%d")
@@ -73,8 +74,10 @@ async def _ninegrid(
     # Initialize adapter
     adapter = get_adapter(adapter_name)
 
-    # Process each scene
-    saved = []
+    # Compose each scene's prompt first, then render them all in one
+    # render_many call so batching backends get the whole grid at once
+    images_dir = story_dir / "images"
+    jobs = []  # (idx, scene, original, modulated, freq, freq_hash, target)
     for i, scene in enumerate(scenes, 1):
         try:
             # Parse scene frequency override
@@ -86,60 +89,71 @@ async def _ninegrid(
                     print(f"Invalid JSON in scene {i} freq: {scene.get('freq')}")
 
             # Compose final frequency
-            final_freq = compose_frequency(
-                base_profile, freq_story_override, scene_freq_override
-            )
+            final_freq = compose_frequency(story_freq, scene_freq_override)
 
             # Modulate prompt with frequency and bible data
             original_prompt = scene["prompt"]
             modulated_prompt, freq_hash = modulate_prompt(
-                original_prompt, final_freq, bible_data
+                original_prompt, final_freq, bible_suffix=bible_suffix
             )
 
             print(f"Scene {i} - Original: {original_prompt[:100]}...")
             print(f"Scene {i} - Modulated: {modulated_prompt[:100]}...")
 
-            # Render image
-            result = await adapter.render(project=story, prompt=modulated_prompt)
-
-            # Create images directory
-            images_dir = story_dir / "images"
-            images_dir.mkdir(exist_ok=True)
-
-            # Copy image with proper naming
-            import shutil
-
-            target_file = images_dir / f"{i:02d}_{scene['scene_id']}.png"
-
-            # Handle different file types
-            if result.path.suffix == ".txt":
-                # Dummy adapter creates .txt files
-                target_file = images_dir / f"{i:02d}_{scene['scene_id']}.txt"
-                shutil.copy2(result.path, target_file)
-            else:
-                # Real image adapters create image files
-                shutil.copy2(result.path, target_file)
-
-            # Clean up the original adapter output directory immediately
-            try:
-                if result.path.parent.exists() and result.path.parent != images_dir:
-                    # Remove all files in the adapter directory first
-                    for file in result.path.parent.iterdir():
-                        if file.is_file():
-                            file.unlink()
-                    # Then remove the directory
-                    result.path.parent.rmdir()
-                    print(f"Cleaned up adapter directory: {result.path.parent}")
-            except Exception as e:
-                print(f"Warning: Could not clean up {result.path.parent}: {e}")
+            # Render straight into images/ (adapters keep their own
+            # extension: the dummy adapter writes .txt stubs)
+            target = images_dir / f"{i:02d}_{scene['scene_id']}.png"
+            jobs.append(
+                (i, scene, original_prompt, modulated_prompt, final_freq, freq_hash, target)
+            )
+        except Exception as e:
+            print(f"Error processing scene {i}: {e}")
 
-            print(f"Scene {i} rendered successfully: {target_file}")
+    # Registered below together with the content hash, so register=False here
+    results = await adapter.render_many(
+        story,
+        [job[3] for job in jobs],
+        targets=[job[6] for job in jobs],
+        register=False,
+        return_exceptions=True,
+    )
+
+    saved = []
+    prompt_rows = []
+    for job, result in zip(jobs, results):
+        i, scene, original_prompt, modulated_prompt, final_freq, freq_hash, target = job
+        try:
+            if isinstance(result, BaseException):
+                raise result
+            target_file = result.path
+            if target_file.parent != images_dir:
+                # Adapter ignored the target (e.g. a plugin); move, don't copy
+                adapter_dir = target_file.parent
+                target_file = move_file(target_file, target.with_suffix(target_file.suffix))
+                shutil.rmtree(adapter_dir, ignore_errors=True)
+
+            # Hand the file to the content-addressed store: a new blob is just a
+            # second link to it, a duplicate render is swapped for the shared blob
+            digest = await asyncio.to_thread(
+                cas.adopt, target_file, result.meta.get("sha256")
+            )
+
+            register_artifact(
+                target_file,
+                adapter=adapter_name,
+                project=slug,
+                prompt=modulated_prompt,
+                duration_ms=result.meta.get("duration_ms"),
+                sha256=digest,
+                scene_id=scene["scene_id"],
+                idx=i,
+            )
 
             # Save scene data
             scene_data = {
                 "idx": i,
                 "scene_id": scene["scene_id"],
-                "file": f"{i:02d}_{scene['scene_id']}.png",
+                "file": target_file.name,
                 "prompt_hash": hashlib.sha1(modulated_prompt.encode()).hexdigest()[:8],
                 "freq_profile_id": final_freq.get("id", "unknown"),
                 "freq_hash": freq_hash,
@@ -149,8 +163,20 @@ async def _ninegrid(
                 },
             }
             saved.append(scene_data)
+            prompt_rows.append(
+                ScenePrompt(
+                    story=story,
+                    slug=slug,
+                    scene_id=scene["scene_id"],
+                    idx=i,
+                    prompt=original_prompt,
+                    modulated_prompt=modulated_prompt,
+                    prompt_hash=scene_data["prompt_hash"],
+                    freq_profile_id=scene_data["freq_profile_id"],
+                )
+            )
 
-            print(f"Scene {i} rendered successfully: {result.path}")
+            print(f"Scene {i} rendered successfully: {target_file}")
 
         except Exception as e:
             print(f"Error processing scene {i}: {e}")
@@ -182,11 +208,18 @@ async def _ninegrid(
     # Save meta.json
     with open(f"{story_dir}/meta.json", "w") as f:
         json.dump(meta, f, indent=2)
+    register_artifact(story_dir / "meta.json", adapter="ninegrid", project=slug, kind="meta")
+
+    # Record scene prompts (indexed for /api/search)
+    try:
+        async with session_scope() as s:
+            s.add_all(prompt_rows)
+    except Exception as e:
+        print(f"⚠️  Could not record scene prompts: {e}")
 
     # Generate Instagram captions automatically
     try:
         import httpx
-        import asyncio
 
         async def generate_captions():
             async with httpx.AsyncClient(timeout=30) as client:
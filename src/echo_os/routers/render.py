@@ -1,28 +1,31 @@
 """Render API endpoints"""
 
 from __future__ import annotations
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from ..adapters.render.dummy import DummyRenderAdapter
-from ..adapters.render.comfyui import ComfyUIRenderAdapter
+from pydantic import BaseModel, Field
+from ..adapters.render import get_adapter
 
 router = APIRouter()
 
 
 class RenderIn(BaseModel):
     project: str
-    prompt: str
-    adapter: str = "dummy"  # "dummy" | "comfyui"
+    prompt: Optional[str] = None
+    prompts: List[str] = Field(default_factory=list, max_length=256)  # rendered as one batch
+    adapter: str = "dummy"  # any name listed by /api/adapters
 
 
 @router.post("/render")
 async def render_endpoint(data: RenderIn):
-    if data.adapter == "dummy":
-        adapter = DummyRenderAdapter()
-    elif data.adapter == "comfyui":
-        adapter = ComfyUIRenderAdapter()
-    else:
+    try:
+        adapter = get_adapter(data.adapter)
+    except ValueError:
         raise HTTPException(400, "unknown adapter")
+    prompts = ([data.prompt] if data.prompt else []) + data.prompts
+    if not prompts:
+        raise HTTPException(422, "prompt or prompts required")
 
-    res = await adapter.render(project=data.project, prompt=data.prompt)
-    return {"ok": True, "adapter": adapter.name, "path": str(res.path)}
+    results = await adapter.render_many(data.project, prompts)
+    paths = [str(r.path) for r in results]
+    return {"ok": True, "adapter": adapter.name, "path": paths[0], "paths": paths}
@@ -0,0 +1,20 @@
+"""Search API endpoints"""
+
+from __future__ import annotations
+from typing import Literal, Optional
+from fastapi import APIRouter, Query
+from ..store import read_scope
+from ..search import search
+
+router = APIRouter()
+
+
+@router.get("/search")
+async def search_endpoint(
+    q: str = Query(..., min_length=1),
+    kind: Optional[Literal["log", "task", "scene"]] = None,
+    limit: int = Query(20, ge=1, le=200),
+):
+    async with read_scope() as s:
+        hits = await search(s, q, kind=kind, limit=limit)
+    return {"q": q, "count": len(hits), "results": hits}
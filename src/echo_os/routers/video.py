@@ -3,10 +3,9 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
-import json
 import os
-from pathlib import Path
 
+from ..artifacts.stories import find_story
 from ..utils.video_renderer import build_video, convert_echo_os_meta_to_spec
 
 router = APIRouter()
@@ -29,56 +28,27 @@ class VideoRequest(BaseModel):
 
 def load_story_meta(slug: str) -> Dict[str, Any]:
     """Load story metadata from artifacts"""
-    artifacts_dir = Path("artifacts")
-    story_dir = None
-
-    for date_dir in artifacts_dir.iterdir():
-        if date_dir.is_dir():
-            for story_subdir in date_dir.iterdir():
-                if story_subdir.is_dir() and slug in story_subdir.name:
-                    story_dir = story_subdir
-                    break
-        if story_dir:
-            break
-
-    if not story_dir or not story_dir.exists():
+    story = find_story(slug)
+    if story is None:
         raise HTTPException(404, f"Story not found: {slug}")
-
-    meta_file = story_dir / "meta.json"
-    if not meta_file.exists():
-        raise HTTPException(404, f"Meta file not found for: {slug}")
-
-    with open(meta_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return story.load_meta()
 
 
 @router.post("/generate")
 async def generate_video(request: VideoRequest, background_tasks: BackgroundTasks):
     """Generate Reels video from story using MoviePy"""
     try:
-        # Load story metadata
-        meta = load_story_meta(request.slug)
+        # Load story metadata (one lookup gives both the directory and meta)
+        story = find_story(request.slug)
+        if story is None:
+            raise HTTPException(404, f"Story not found: {request.slug}")
+        story_dir = story.dir
+        meta = story.load_meta()
         scenes = meta.get("scenes", [])
 
         if not scenes:
             raise HTTPException(400, "No scenes found in story")
 
-        # Find story directory
-        artifacts_dir = Path("artifacts")
-        story_dir = None
-
-        for date_dir in artifacts_dir.iterdir():
-            if date_dir.is_dir():
-                for story_subdir in date_dir.iterdir():
-                    if story_subdir.is_dir() and request.slug in story_subdir.name:
-                        story_dir = story_subdir
-                        break
-            if story_dir:
-                break
-
-        if not story_dir:
-            raise HTTPException(404, f"Story directory not found: {request.slug}")
-
         # Check if images directory exists
         images_dir = story_dir / "images"
         if not images_dir.exists():
@@ -141,20 +111,10 @@ async def get_video(slug: str):
     """Get existing video for a story"""
     try:
         # Find story directory
-        artifacts_dir = Path("artifacts")
-        story_dir = None
-
-        for date_dir in artifacts_dir.iterdir():
-            if date_dir.is_dir():
-                for story_subdir in date_dir.iterdir():
-                    if story_subdir.is_dir() and slug in story_subdir.name:
-                        story_dir = story_subdir
-                        break
-            if story_dir:
-                break
-
-        if not story_dir:
+        story = find_story(slug)
+        if story is None:
             raise HTTPException(404, f"Story not found: {slug}")
+        story_dir = story.dir
 
         # Look for video files
         video_files = list(story_dir.glob("*_reel.mp4"))
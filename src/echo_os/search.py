@@ -0,0 +1,134 @@
+"""Full-text search — SQLite FTS5 index over logs, tasks and scene prompts"""
+
+from __future__ import annotations
+import re
+from typing import Any, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+# Each source row maps to a fixed FTS rowid (id * 4 + kind code), so triggers
+# can update/delete index entries by rowid instead of scanning the index.
+SOURCES = {
+    "log": {"code": 1, "table": "echolog", "title": "title", "body": "content"},
+    "task": {"code": 2, "table": "task", "title": "title", "body": "description"},
+    "scene": {
+        "code": 3,
+        "table": "sceneprompt",
+        "title": "{row}.slug || ' ' || {row}.scene_id",
+        "body": "prompt",
+    },
+}
+
+_FTS_TABLE = """
+CREATE VIRTUAL TABLE search_fts USING fts5(
+    kind UNINDEXED, ref_id UNINDEXED, title, body,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+
+def _col(expr: str, row: str) -> str:
+    return expr.format(row=row) if "{row}" in expr else f"{row}.{expr}"
+
+
+def _trigger_ddl(kind: str, src: Dict[str, Any]) -> List[str]:
+    t, code = src["table"], src["code"]
+    new_title, new_body = _col(src["title"], "new"), _col(src["body"], "new")
+    return [
+        f"DROP TRIGGER IF EXISTS {t}_fts_ai",
+        f"DROP TRIGGER IF EXISTS {t}_fts_ad",
+        f"DROP TRIGGER IF EXISTS {t}_fts_au",
+        f"""CREATE TRIGGER {t}_fts_ai AFTER INSERT ON {t} BEGIN
+            INSERT INTO search_fts(rowid, kind, ref_id, title, body)
+            VALUES (new.id * 4 + {code}, '{kind}', new.id, {new_title}, {new_body});
+        END""",
+        f"""CREATE TRIGGER {t}_fts_ad AFTER DELETE ON {t} BEGIN
+            DELETE FROM search_fts WHERE rowid = old.id * 4 + {code};
+        END""",
+        f"""CREATE TRIGGER {t}_fts_au AFTER UPDATE ON {t} BEGIN
+            UPDATE search_fts SET title = {new_title}, body = {new_body}
+            WHERE rowid = old.id * 4 + {code};
+        END""",
+    ]
+
+
+def ensure_search_index(sync_conn) -> bool:
+    """Create the FTS5 table and sync triggers; backfill on first creation"""
+    exists = sync_conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='search_fts'")
+    ).first()
+    try:
+        if not exists:
+            sync_conn.execute(text(_FTS_TABLE))
+    except OperationalError as e:  # SQLite built without FTS5
+        print(f"⚠️  Full-text search disabled: {e}")
+        return False
+
+    for kind, src in SOURCES.items():
+        for ddl in _trigger_ddl(kind, src):
+            sync_conn.execute(text(ddl))
+        if not exists:
+            t = src["table"]
+            sync_conn.execute(
+                text(
+                    f"INSERT INTO search_fts(rowid, kind, ref_id, title, body) "
+                    f"SELECT id * 4 + {src['code']}, '{kind}', id, "
+                    f"{_col(src['title'], t)}, {_col(src['body'], t)} FROM {t}"
+                )
+            )
+    return True
+
+
+def to_match_query(q: str) -> Optional[str]:
+    """Turn free text into a safe FTS5 query: quoted AND-ed terms, last one prefix-matched"""
+    terms = re.findall(r"\w+", q, flags=re.UNICODE)
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+async def search(
+    session,
+    q: str,
+    kind: Optional[str] = None,
+    limit: int = 20,
+    mark: tuple[str, str] = ("<mark>", "</mark>"),
+) -> List[Dict[str, Any]]:
+    """Ranked (bm25, titles weighted 5x) hits with highlighted snippets"""
+    match = to_match_query(q)
+    if not match:
+        return []
+
+    where = "search_fts MATCH :match"
+    params: Dict[str, Any] = {"match": match, "limit": limit, "l": mark[0], "r": mark[1]}
+    if kind:
+        where += " AND kind = :kind"
+        params["kind"] = kind
+
+    res = await session.execute(
+        text(
+            f"""
+            SELECT kind, ref_id,
+                   snippet(search_fts, 2, :l, :r, '…', 10) AS title,
+                   snippet(search_fts, 3, :l, :r, '…', 24) AS snippet,
+                   bm25(search_fts, 0.0, 0.0, 5.0, 1.0) AS score
+            FROM search_fts
+            WHERE {where}
+            ORDER BY score
+            LIMIT :limit
+            """
+        ),
+        params,
+    )
+    return [
+        {
+            "kind": r.kind,
+            "id": r.ref_id,
+            "title": r.title,
+            "snippet": r.snippet,
+            "score": round(-r.score, 4),
+        }
+        for r in res.all()
+    ]
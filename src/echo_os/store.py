@@ -1,19 +1,122 @@
 from __future__ import annotations
 from contextlib import asynccontextmanager
+from sqlalchemy import event, text
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
 DATABASE_URL = f"sqlite+aiosqlite:///{settings.db_path}"
-engine = create_async_engine(DATABASE_URL, future=True)
+
+
+def _apply_pragmas(dbapi_conn, read_only: bool = False) -> None:
+    """Apply the storage profile from settings to a fresh SQLite connection"""
+    cur = dbapi_conn.cursor()
+    cur.execute(f"PRAGMA busy_timeout={int(settings.db_busy_timeout)}")
+    cur.execute(f"PRAGMA journal_mode={settings.db_journal_mode}")
+    cur.execute(f"PRAGMA synchronous={settings.db_synchronous}")
+    cur.execute(f"PRAGMA mmap_size={int(settings.db_mmap_size)}")
+    cur.execute(f"PRAGMA cache_size={int(settings.db_cache_size)}")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    if read_only:
+        cur.execute("PRAGMA query_only=ON")
+    cur.close()
+
+
+def _make_engine(pool_size: int, read_only: bool = False) -> AsyncEngine:
+    eng = create_async_engine(
+        DATABASE_URL,
+        future=True,
+        pool_size=pool_size,
+        max_overflow=0,
+        connect_args={"timeout": settings.db_busy_timeout / 1000},
+    )
+
+    @event.listens_for(eng.sync_engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        _apply_pragmas(dbapi_conn, read_only=read_only)
+
+    return eng
+
+
+# SQLite allows a single writer at a time; funnelling writes through one pooled
+# connection serializes them in-process instead of failing with "database is locked".
+engine = _make_engine(pool_size=1)
+# WAL readers never block the writer, so reads get their own query-only pool.
+read_engine = (
+    _make_engine(pool_size=settings.db_read_pool_size, read_only=True)
+    if settings.db_read_pool_size > 0
+    else engine
+)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+AsyncReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+def _rebuild_table(sync_conn, table, disk_cols: set[str]) -> None:
+    """Recreate `table` from the model and copy rows over (SQLite can't ALTER constraints)"""
+    old = f"_old_{table.name}"
+    for idx in table.indexes:
+        sync_conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{idx.name}"')
+    # legacy mode keeps foreign keys in other tables pointing at the original name
+    sync_conn.exec_driver_sql("PRAGMA legacy_alter_table=ON")
+    sync_conn.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{old}"')
+    sync_conn.exec_driver_sql("PRAGMA legacy_alter_table=OFF")
+    table.create(sync_conn)
+
+    targets, sources, params = [], [], {}
+    for c in table.columns:
+        if c.name in disk_cols:
+            targets.append(f'"{c.name}"')
+            sources.append(f'"{c.name}"')
+        elif not c.nullable:
+            default = c.default.arg if c.default is not None and c.default.is_scalar else ""
+            params[f"d_{c.name}"] = default
+            targets.append(f'"{c.name}"')
+            sources.append(f":d_{c.name}")
+    sync_conn.execute(
+        text(
+            f'INSERT INTO "{table.name}" ({", ".join(targets)}) '
+            f'SELECT {", ".join(sources)} FROM "{old}"'
+        ),
+        params,
+    )
+    sync_conn.exec_driver_sql(f'DROP TABLE "{old}"')
+
+
+def _sync_columns(sync_conn) -> None:
+    """Bring existing tables up to date with columns added or relaxed in the models"""
+    for table in SQLModel.metadata.sorted_tables:
+        info = sync_conn.exec_driver_sql(f'PRAGMA table_info("{table.name}")').all()
+        if not info:
+            continue
+        notnull = {row[1]: bool(row[3]) for row in info}
+        stale = any(
+            c.name not in notnull or (notnull[c.name] and c.nullable and not c.primary_key)
+            for c in table.columns
+        )
+        if stale:
+            _rebuild_table(sync_conn, table, set(notnull))
+
+
+def _ensure_indexes(sync_conn) -> None:
+    """create_all skips existing tables, so add indexes declared after they were made"""
+    for table in SQLModel.metadata.sorted_tables:
+        for idx in table.indexes:
+            idx.create(sync_conn, checkfirst=True)
 
 
 async def init_db() -> None:
+    from . import models  # noqa: F401  (register tables on the metadata)
+    from .search import ensure_search_index
+
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_sync_columns)
+        await conn.run_sync(_ensure_indexes)
+        await conn.run_sync(ensure_search_index)
 
 
 @asynccontextmanager
@@ -25,3 +128,10 @@ async def session_scope():
         except Exception:
             await session.rollback()
             raise
+
+
+@asynccontextmanager
+async def read_scope():
+    """Read-only session from the reader pool; never commits"""
+    async with AsyncReadSessionLocal() as session:
+        yield session
@@ -1,11 +1,170 @@
-"""Bible Renderer — Story Bible generation and rendering utilities"""
+"""Bible Renderer — Story Bible generation and rendering utilities
+
+`render_bible` asks the LLM for a bible matching BIBLE_SCHEMA and caches the
+result in the StoryBible table, keyed by a hash of the title and scene
+prompts, so a story is only ever paid for once. If the LLM call fails the
+keyword heuristic is used instead (and not cached).
+"""
 
 from __future__ import annotations
-from typing import Dict, Any, List
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import select
+from ..config import settings
+
+# Bump when the schema or prompt changes so cached bibles are regenerated
+BIBLE_VERSION = 1
+
+# (messages, response_format) -> JSON text
+LLM = Callable[[List[Dict[str, Any]], Dict[str, Any]], Awaitable[str]]
+
+
+def _obj(properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+_STR = {"type": "string"}
+
+BIBLE_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "story_bible",
+        "strict": True,
+        "schema": _obj(
+            {
+                "world": _STR,
+                "style": _STR,
+                "characters": {
+                    "type": "array",
+                    "items": _obj({"name": _STR, "role": _STR, "description": _STR}),
+                },
+                "props": {
+                    "type": "array",
+                    "items": _obj({"name": _STR, "description": _STR}),
+                },
+                "camera": _obj({"lens": _STR, "look": _STR, "dof": _STR}),
+                "lighting_palette": _STR,
+                "hashtags": {"type": "array", "items": _STR},
+            }
+        ),
+    },
+}
+
+_SYSTEM = (
+    "You are a film pre-production designer. From a story title and its scene "
+    "prompts, write a story bible that keeps characters, props, world, camera "
+    "and lighting consistent across every shot. Describe each recurring "
+    "character and prop visually in one sentence. Hashtags start with '#'."
+)
+
+
+def bible_cache_key(story: str, scenes: List[Dict[str, Any]]) -> str:
+    prompts = [scene.get("prompt", "") for scene in scenes]
+    blob = json.dumps([BIBLE_VERSION, story, prompts], ensure_ascii=False)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def bible_messages(story: str, scenes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    lines = [
+        f"{i}. [{scene.get('scene_id', i)}] {scene.get('prompt', '')}"
+        for i, scene in enumerate(scenes, 1)
+    ]
+    return [
+        {"role": "system", "content": _SYSTEM},
+        {"role": "user", "content": f"Story: {story}\nScenes:\n" + "\n".join(lines)},
+    ]
+
+
+def _parse_bible(text: str) -> Dict[str, Any]:
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("bible must be a JSON object")
+    for key in ("characters", "props"):
+        data[key] = [x for x in data.get(key, []) if isinstance(x, dict) and x.get("name")]
+    tags = [t for t in data.get("hashtags", []) if isinstance(t, str) and t]
+    data["hashtags"] = [t if t.startswith("#") else f"#{t}" for t in tags]
+    return data
+
+
+async def _openai_llm(messages: List[Dict[str, Any]], response_format: Dict[str, Any]) -> str:
+    from ..openai_client import chat
+
+    return await chat(messages, response_format=response_format)
+
+
+async def _cached(key: str) -> Optional[Dict[str, Any]]:
+    from ..models import StoryBible
+    from ..store import read_scope
+
+    async with read_scope() as s:
+        row = (await s.exec(select(StoryBible.data).where(StoryBible.key == key))).first()
+    return json.loads(row) if row else None
+
+
+async def _store(key: str, story: str, model: str, data: Dict[str, Any]) -> None:
+    from ..models import StoryBible
+    from ..store import session_scope
+
+    values = {
+        "key": key,
+        "story": story,
+        "model": model,
+        "data": json.dumps(data, ensure_ascii=False),
+    }
+    async with session_scope() as s:
+        # Concurrent runs of the same story: first writer wins
+        await s.execute(
+            insert(StoryBible).values(**values).on_conflict_do_nothing(index_elements=["key"])
+        )
+
+
+async def render_bible(
+    story: str,
+    scenes: List[Dict[str, Any]],
+    llm: Optional[LLM] = None,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """Generate Story Bible from story and scenes
+
+    Served from the StoryBible cache when this title + prompts were seen
+    before (unless `refresh`). `llm` replaces the OpenAI call, e.g. with a
+    fake in tests.
+    """
+    key = bible_cache_key(story, scenes)
+    if not refresh:
+        try:
+            if (cached := await _cached(key)) is not None:
+                return cached
+        except Exception as e:
+            print(f"⚠️  Bible cache unavailable: {e}")
+
+    if llm is None and not settings.openai_api_key:
+        return heuristic_bible(story, scenes)
+
+    try:
+        text = await (llm or _openai_llm)(bible_messages(story, scenes), BIBLE_SCHEMA)
+        data = _parse_bible(text)
+    except Exception as e:
+        print(f"⚠️  LLM bible generation failed, using heuristic bible: {e}")
+        return heuristic_bible(story, scenes)
+
+    try:
+        await _store(key, story, "custom" if llm else settings.model, data)
+    except Exception as e:
+        print(f"⚠️  Could not cache story bible: {e}")
+    return data
+
 
 
-async def render_bible(story: str, scenes: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate Story Bible from story and scenes"""
+def heuristic_bible(story: str, scenes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Keyword-based fallback bible, used when the LLM is unavailable"""
 
     # Extract characters from scenes
     characters = []
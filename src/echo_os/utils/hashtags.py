@@ -0,0 +1,140 @@
+"""Hashtag Rules — data-driven keyword → hashtag matching
+
+Rules live in `hashtag_rules.json` (or the file named by ECHO_HASHTAG_RULES)
+and are compiled once: small rule sets into per-field keyword tuples, large
+ones into a single alternation regex. Matching lowercases the story title and
+the joined beats once and scans each in one pass.
+"""
+
+from __future__ import annotations
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+from ..config import settings
+
+DEFAULT_RULES = Path(__file__).with_name("hashtag_rules.json")
+FIELDS = ("title", "beats")
+
+
+# Below this many keywords, per-keyword substring checks (C speed) beat one
+# regex scan; above it the alternation wins (see scripts/bench_hashtags.py)
+REGEX_MIN_KEYWORDS = 32
+
+
+@dataclass(frozen=True)
+class HashtagRules:
+    always: Tuple[str, ...]
+    priorities: Dict[str, Tuple[str, ...]]
+    # keyword -> {field: tags}, including tags of keywords contained in it
+    _tags: Dict[str, Dict[str, FrozenSet[str]]]
+    _keywords: Dict[str, Tuple[str, ...]]  # field -> keywords, for small rule sets
+    _partners: Dict[str, Tuple[str, ...]]
+    _pattern: Optional[re.Pattern]
+
+    @classmethod
+    def compile(cls, data: Dict[str, Any]) -> "HashtagRules":
+        direct: Dict[str, Dict[str, set]] = {}
+        for i, rule in enumerate(data.get("rules", [])):
+            field = rule.get("in", "title")
+            if field not in FIELDS:
+                raise ValueError(f"rule {i}: 'in' must be one of {FIELDS}")
+            for kw in rule["match"]:
+                kw = kw.lower()
+                if not kw:
+                    raise ValueError(f"rule {i}: empty keyword")
+                direct.setdefault(kw, {}).setdefault(field, set()).update(rule["tags"])
+
+        # The regex scan is leftmost-longest and non-overlapping. Keywords
+        # contained in a longer one get their tags folded into it; keywords that
+        # can start inside another one ("partners") are confirmed with `in`
+        tags = {}
+        for kw in direct:
+            merged: Dict[str, set] = {}
+            for other, by_field in direct.items():
+                if other in kw:
+                    for field, t in by_field.items():
+                        merged.setdefault(field, set()).update(t)
+            tags[kw] = {f: frozenset(t) for f, t in merged.items()}
+
+        pattern, partners = None, {}
+        if len(direct) >= REGEX_MIN_KEYWORDS:
+            pattern = re.compile("|".join(map(re.escape, sorted(direct, key=len, reverse=True))))
+            for kw in direct:
+                found = {
+                    o
+                    for o in direct
+                    for i in range(1, len(kw))
+                    if o.startswith(kw[i:]) and o != kw[i:]
+                }
+                if found:
+                    partners[kw] = tuple(found)
+
+        return cls(
+            always=tuple(data.get("always", ())),
+            priorities={k: tuple(v) for k, v in data.get("priority", {}).items()},
+            _tags=tags,
+            _keywords={f: tuple(kw for kw, by in direct.items() if f in by) for f in FIELDS},
+            _partners=partners,
+            _pattern=pattern,
+        )
+
+    def _hits(self, field: str, text: str) -> Iterable[str]:
+        if self._pattern is None:
+            return [kw for kw in self._keywords[field] if kw in text]
+        hits = set(self._pattern.findall(text))
+        for kw in list(hits):
+            hits.update(o for o in self._partners.get(kw, ()) if o in text)
+        return hits
+
+    def match(self, title: str, beats: Iterable[str] = ()) -> set:
+        """Tags triggered by keywords in the title and beats (case-insensitive)"""
+        found: set = set()
+        for field, text in (("title", title.lower()), ("beats", "\n".join(beats).lower())):
+            for kw in self._hits(field, text):
+                found.update(self._tags[kw].get(field, ()))
+        return found
+
+    def hashtags(self, meta: Dict[str, Any], story_beats: Sequence[str]) -> List[str]:
+        """Meta hashtags + rule matches + always-on tags, sorted"""
+        tags = set(meta.get("hashtags", ()))
+        tags |= self.match(meta.get("story", ""), story_beats)
+        tags.update(self.always)
+        return sorted(tags)
+
+    def priority(self, platform: str) -> Tuple[str, ...]:
+        return self.priorities.get(platform) or self.priorities.get("default", ())
+
+
+def fit_hashtags(hashtags: Sequence[str], budget: int, priority: Sequence[str]) -> List[str]:
+    """Priority tags first, then the rest in order, within `budget` chars (space-separated)"""
+    selected: List[str] = []
+    used = 0
+    for tag in priority:
+        if used + len(tag) + 1 <= budget:
+            selected.append(tag)
+            used += len(tag) + 1
+
+    skip = set(priority)
+    for tag in hashtags:
+        if tag in skip:
+            continue
+        if used + len(tag) + 1 > budget:
+            break
+        selected.append(tag)
+        used += len(tag) + 1
+    return selected
+
+
+@lru_cache(maxsize=8)
+def _load(path: str, mtime_ns: int) -> HashtagRules:
+    with open(path, "r", encoding="utf-8") as f:
+        return HashtagRules.compile(json.load(f))
+
+
+def load_rules(path: Optional[str] = None) -> HashtagRules:
+    """Compiled rules; recompiled only when the rules file changes"""
+    path = str(path or settings.hashtag_rules or DEFAULT_RULES)
+    return _load(path, Path(path).stat().st_mtime_ns)
@@ -1,4 +1,5 @@
 import asyncio
+import json
 from fastapi.testclient import TestClient
 from echo_os.app import app
 from echo_os.store import init_db
@@ -22,4 +23,450 @@ def test_plan_and_log():
     )
     assert r.status_code == 200
     r2 = c.get("/api/log")
-    assert r2.status_code == 200 and isinstance(r2.json(), list)
+    assert r2.status_code == 200 and isinstance(r2.json()["items"], list)
+
+
+def test_log_keyset_pagination():
+    asyncio.run(init_db())
+
+    c = TestClient(app)
+    for i in range(5):
+        c.post("/api/log", json={"code": f"PAGE/{i}", "title": f"p{i}", "content": "."})
+
+    seen, cursor = [], None
+    for _ in range(10):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = c.get("/api/log", params=params).json()
+        seen.extend(x["id"] for x in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert seen == sorted(seen, reverse=True) and len(seen) == len(set(seen)) >= 5
+    assert c.get("/api/log", params={"cursor": "garbage"}).status_code == 400
+
+
+def test_search_logs():
+    asyncio.run(init_db())
+
+    c = TestClient(app)
+    c.post(
+        "/api/log",
+        json={"code": "ECHO.LOG/777", "title": "Lighthouse", "content": "amber fractal tide"},
+    )
+    r = c.get("/api/search", params={"q": "fract", "kind": "log"})
+    assert r.status_code == 200
+    hit = r.json()["results"][0]
+    assert hit["kind"] == "log" and "<mark>fractal</mark>" in hit["snippet"]
+
+
+def test_bulk_log_ingest():
+    asyncio.run(init_db())
+
+    c = TestClient(app)
+    rows = [{"code": f"BULK/{i}", "title": f"b{i}", "content": "bulk"} for i in range(7)]
+    r = c.post("/api/log/bulk", json=rows)
+    assert r.status_code == 200 and r.json()["count"] == 7
+    ids = r.json()["ids"]
+    assert ids == sorted(ids)
+
+    ndjson = "\n".join(json.dumps(x) for x in rows[:3]) + "\n"
+    r = c.post(
+        "/api/log/bulk", content=ndjson, headers={"content-type": "application/x-ndjson"}
+    )
+    assert r.json()["count"] == 3 and r.json()["ids"][0] > ids[-1]
+
+    r = c.post("/api/log/bulk", json=[rows[0], {"code": "x"}])
+    assert r.status_code == 422
+
+
+def test_render_registers_artifact(tmp_path, monkeypatch):
+    from echo_os.config import settings
+    from echo_os.artifacts.registry import registry
+
+    monkeypatch.setattr(settings, "artifact_dir", str(tmp_path))
+    asyncio.run(init_db())
+
+    with TestClient(app) as c:
+        r = c.post(
+            "/api/render",
+            json={"project": "Registry Test", "prompt": "neon tide", "adapter": "dummy"},
+        )
+        assert r.status_code == 200
+        c.portal.call(registry.flush)
+
+        body = c.get(
+            "/api/artifacts", params={"project": "Registry Test", "adapter": "dummy"}
+        ).json()
+        assert body["items"][0]["path"] == r.json()["path"]
+        assert body["items"][0]["kind"] == "text" and len(body["items"][0]["sha256"]) == 64
+
+
+def test_cas_dedup_and_gc(tmp_path, monkeypatch):
+    import os
+    from echo_os.config import settings
+    from echo_os.artifacts import cas
+
+    monkeypatch.setattr(settings, "artifact_dir", str(tmp_path))
+    a, b = tmp_path / "a.png", tmp_path / "b.png"
+    a.write_bytes(b"same pixels")
+    b.write_bytes(b"same pixels")
+    da = cas.store(a, tmp_path / "story" / "01.png")
+    db = cas.store(b, tmp_path / "story" / "02.png")
+    assert da == db and os.path.samefile(tmp_path / "story" / "01.png", tmp_path / "story" / "02.png")
+
+    for p in (a, b, tmp_path / "story" / "01.png"):
+        p.unlink()
+    assert cas.gc(grace_seconds=0)["removed"] == 0
+    (tmp_path / "story" / "02.png").unlink()
+    assert cas.gc(grace_seconds=0)["removed"] == 1
+
+
+def test_frequency_profiles_cached_and_immutable(tmp_path):
+    from echo_os.adapters.resonance import ProfileRegistry, compose_frequency, modulate_prompt
+
+    (tmp_path / "neon.json").write_text(
+        json.dumps({"id": "neon", "weights": {"warmth": 0.9, "surreal": 0.1}, "negatives": ["no text"]})
+    )
+    profiles = ProfileRegistry(tmp_path)
+    base = profiles.get("neon")
+    assert profiles.get("neon") is base
+
+    composed = compose_frequency(base, {"weights": {"surreal": 0.8}})
+    assert base["weights"]["surreal"] == 0.1
+    assert composed["weights"] == {"warmth": 0.9, "surreal": 0.8}
+    assert compose_frequency(base, {"weights": {"surreal": 0.8}}) is composed
+    prompt, freq_hash = modulate_prompt("city", composed)
+    assert prompt == "city ; subtle surreal symbolism ; warm light bias ; no text"
+    assert freq_hash == composed.digest
+
+
+def test_frequency_api_snapshot_and_diff(tmp_path, monkeypatch):
+    from echo_os.config import settings
+
+    monkeypatch.setattr(settings, "frequency_dir", str(tmp_path))
+    (tmp_path / "amber.json").write_text(
+        json.dumps({"id": "amber_v1", "weights": {"warmth": 0.8}, "negatives": ["no text"]})
+    )
+    c = TestClient(app)
+    assert [p["id"] for p in c.get("/api/frequency").json()["items"]] == ["amber_v1"]
+
+    first = c.post("/api/frequency/amber_v1/snapshot", json={"user": "a"}).json()
+    second = c.post(
+        "/api/frequency/amber/snapshot",
+        json={"user": "b", "overrides": {"weights": {"warmth": 0.2}}},
+    ).json()
+    assert len(c.get("/api/frequency/snapshots").json()["items"]) == 2
+
+    d = c.get("/api/frequency/diff", params={"a": first["name"], "b": second["name"]}).json()
+    assert d["changes"] == [{"path": "weights.warmth", "op": "changed", "from": 0.8, "to": 0.2}]
+    assert c.post("/api/frequency/validate", json={"weights": {"warmth": "hot"}}).json()[
+        "errors"
+    ] == ["weights.warmth: expected a number"]
+    assert c.post("/api/frequency/amber/snapshot", json={"user": "../x"}).status_code == 422
+
+
+def test_caption_batch_all_platforms(tmp_path, monkeypatch):
+    from echo_os.config import settings
+
+    monkeypatch.setattr(settings, "artifact_dir", str(tmp_path))
+    for date, slug in [("2025-01-01", "neon-tide"), ("2025-01-02", "glass-river")]:
+        d = tmp_path / date / slug
+        d.mkdir(parents=True)
+        (d / "meta.json").write_text(
+            json.dumps({"story": slug, "scenes": [{"scene_id": "neon_gate"}]})
+        )
+
+    with TestClient(app) as c:
+        r = c.post("/api/captions/batch", json={"platforms": ["instagram", "x"]}).json()
+        assert r["successful"] == 4 and r["failed"] == 0
+        assert (tmp_path / "2025-01-01" / "neon-tide" / "instagram_caption.txt").exists()
+        x = c.get("/api/captions/glass-river", params={"platform": "x"}).json()
+        assert "Neon Gate" in x["caption"]
+
+        r = c.post("/api/captions/batch", json={"slugs": ["missing"]}).json()
+        assert r["failed"] == 1
+
+
+def test_hashtag_rules_small_and_regex_paths():
+    from echo_os.utils.hashtags import REGEX_MIN_KEYWORDS, HashtagRules, fit_hashtags
+
+    rules = [
+        {"in": "beats", "match": ["protokol"], "tags": ["#P"]},
+        {"in": "beats", "match": ["kolu"], "tags": ["#K"]},
+        {"in": "title", "match": ["neon"], "tags": ["#N"]},
+    ]
+    filler = [{"in": "beats", "match": [f"zz{i}"], "tags": []} for i in range(REGEX_MIN_KEYWORDS)]
+    for data in ({"rules": rules}, {"rules": rules + filler}):
+        engine = HashtagRules.compile({**data, "always": ["#ECHOOS"]})
+        assert engine.match("Neon", ["ProtoKolu"]) == {"#N", "#P", "#K"}
+        assert engine.match("x", ["neon"]) == set()
+        assert engine.hashtags({"story": "neon"}, []) == ["#ECHOOS", "#N"]
+
+    assert fit_hashtags(["#A", "#Bbbbbb", "#C"], 7, ["#C", "#Zzzzzzzz"]) == ["#C", "#A"]
+
+
+def test_story_bible_llm_cached(tmp_path):
+    from echo_os.utils.bible_renderer import BIBLE_SCHEMA, render_bible
+
+    calls = []
+
+    async def fake_llm(messages, response_format):
+        calls.append(messages)
+        assert response_format is BIBLE_SCHEMA
+        return json.dumps(
+            {
+                "world": "Tidal neon city",
+                "style": "Cinematic",
+                "characters": [{"name": "Mira", "role": "Lead", "description": "silver coat"}],
+                "props": [],
+                "camera": {"lens": "35mm", "look": "soft", "dof": "shallow"},
+                "lighting_palette": "teal dusk",
+                "hashtags": ["NeonTide"],
+            }
+        )
+
+    async def broken_llm(messages, response_format):
+        raise RuntimeError("offline")
+
+    scenes = [{"scene_id": "s1", "prompt": "Mira walks the tide wall"}]
+
+    async def run():
+        await init_db()
+        first = await render_bible("Bible Cache Test", scenes, llm=fake_llm)
+        again = await render_bible("Bible Cache Test", scenes, llm=fake_llm)
+        fallback = await render_bible("Bible Cache Test 2", scenes, llm=broken_llm)
+        return first, again, fallback
+
+    first, again, fallback = asyncio.run(run())
+    assert len(calls) == 1 and "Mira walks the tide wall" in calls[0][1]["content"]
+    assert again == first and first["hashtags"] == ["#NeonTide"]
+    assert fallback["camera"]["lens"] == "35mm" and fallback["characters"] == []
+
+
+def _fake_openai(content, calls):
+    """AsyncOpenAI client wired to an in-process fake /v1/chat/completions"""
+    import httpx
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+    from openai import AsyncOpenAI
+
+    fake = FastAPI()
+
+    @fake.post("/v1/chat/completions")
+    async def completions(body: dict):
+        calls.append(body)
+        await asyncio.sleep(0.05)  # keep the leader in flight while followers arrive
+        base = {"id": "chatcmpl-1", "created": 0, "model": body["model"]}
+        if not body.get("stream"):
+            message = {"role": "assistant", "content": content}
+            return {
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "finish_reason": "stop", "message": message}],
+            }
+
+        def chunk(text):
+            choice = {"index": 0, "delta": {"content": text}, "finish_reason": None}
+            return {**base, "object": "chat.completion.chunk", "choices": [choice]}
+
+        pieces = [content[i : i + 5] for i in range(0, len(content), 5)]
+        body = "".join(f"data: {json.dumps(chunk(p))}\n\n" for p in pieces)
+        return StreamingResponse(iter([body + "data: [DONE]\n\n"]), media_type="text/event-stream")
+
+    return AsyncOpenAI(
+        api_key="sk-test",
+        base_url="http://fake/v1",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=fake)),
+    )
+
+
+def test_llm_cache_with_fake_openai_server():
+    from echo_os import openai_client
+
+    calls = []
+    openai_client.set_client(_fake_openai("- draft storyboard\n- render grid", calls))
+    try:
+
+        async def burst():
+            await init_db()
+            return await asyncio.gather(
+                *(openai_client.suggest_tasks("cache ctx", "cache proj") for _ in range(5))
+            )
+
+        assert all(r == ["draft storyboard", "render grid"] for r in asyncio.run(burst()))
+        assert len(calls) == 1
+
+        c = TestClient(app)
+        r = c.post("/api/plan", json={"project": "cache proj", "context": "cache ctx"})
+        assert r.json()["tasks"] == ["draft storyboard", "render grid"] and len(calls) == 1
+        stats = c.get("/api/llm/cache").json()
+        assert stats["hits"] >= 1 and stats["coalesced"] >= 4 and stats["entries"] >= 1
+    finally:
+        openai_client.set_client(None)
+
+
+def test_plan_stream_persists_tasks_incrementally():
+    from echo_os import openai_client
+
+    calls = []
+    openai_client.set_client(_fake_openai("- sketch frames\n- light pass\n- final grade", calls))
+    try:
+        c = TestClient(app)
+        with c.stream(
+            "POST", "/api/plan/stream", json={"project": "stream proj", "context": "stream ctx"}
+        ) as r:
+            events = [
+                (block.split("\n")[0][7:], json.loads(block.split("\n")[1][6:]))
+                for block in r.read().decode().strip().split("\n\n")
+            ]
+        assert [e for e, _ in events] == ["task", "task", "task", "done"]
+        assert [d["title"] for _, d in events[:3]] == ["sketch frames", "light pass", "final grade"]
+        ids = events[-1][1]["task_ids"]
+        tasks = c.get("/api/task", params={"project_id": events[-1][1]["project_id"]}).json()
+        assert sorted(t["id"] for t in tasks["items"]) == sorted(ids)
+        assert calls[0]["stream"] is True
+    finally:
+        openai_client.set_client(None)
+
+
+def _fake_comfy(queued, down=False):
+    import httpx
+    from fastapi import FastAPI, Response
+
+    fake = FastAPI()
+
+    @fake.get("/system_stats")
+    async def system_stats():
+        return Response(status_code=503 if down else 200)
+
+    @fake.post("/prompt")
+    async def prompt(body: dict):
+        if down:
+            return Response("out of memory", status_code=500)
+        queued.append(body["prompt"])
+        return {"prompt_id": f"p{len(queued)}", "number": len(queued), "node_errors": {}}
+
+    @fake.get("/history/{pid}")
+    async def history(pid: str):
+        graph = queued[int(pid[1:]) - 1]
+        outputs = {
+            nid: {"images": [{"filename": f"{nid}.png", "subfolder": "", "type": "output"}]}
+            for nid, node in graph.items()
+            if node["class_type"] == "SaveImage"
+        }
+        return {pid: {"outputs": outputs, "status": {"status_str": "success", "completed": True}}}
+
+    @fake.get("/view")
+    async def view(filename: str, type: str):
+        return Response(b"PNG:" + filename.encode(), media_type="image/png")
+
+    return httpx.ASGITransport(app=fake)
+
+
+def test_comfyui_batches_prompts_into_one_job(tmp_path):
+    from echo_os.adapters.render.comfyui import ComfyUIRenderAdapter
+
+    queued = []
+    adapter = ComfyUIRenderAdapter("http://comfy", transport=_fake_comfy(queued), websocket=False)
+    prompts = ["red moon", "blue tide", "green ash"]
+    targets = [tmp_path / f"scene_{i}.png" for i in range(3)]
+    results = asyncio.run(
+        adapter.render_many("comfy proj", prompts, targets=targets, register=False, steps=4)
+    )
+
+    assert len(queued) == 1
+    graph = queued[0]
+    kinds = [n["class_type"] for n in graph.values()]
+    assert kinds.count("SaveImage") == 3 and kinds.count("CheckpointLoaderSimple") == 1
+    assert all(n["inputs"]["steps"] == 4 for n in graph.values() if n["class_type"] == "KSampler")
+    texts = {n["inputs"]["text"] for n in graph.values() if n["class_type"] == "CLIPTextEncode"}
+    assert set(prompts) <= texts
+    for result, target in zip(results, targets):
+        assert result.path == target and target.read_bytes().startswith(b"PNG:")
+        assert result.meta["prompt_id"] == "p1" and len(result.meta["sha256"]) == 64
+
+
+def test_render_pool_balances_and_fails_over(tmp_path):
+    from echo_os.adapters.render.comfyui import ComfyUIRenderAdapter
+    from echo_os.adapters.render.pool import RenderPoolAdapter
+
+    queues = [[], [], []]
+    backends = [
+        ComfyUIRenderAdapter(f"http://n{i}", transport=_fake_comfy(q, down=i == 2), websocket=False)
+        for i, q in enumerate(queues)
+    ]
+    pool = RenderPoolAdapter(backends)
+    pool._checked = float("inf")  # skip the periodic probe: exercise failover instead
+    targets = [tmp_path / f"s{i}.png" for i in range(6)]
+    results = asyncio.run(
+        pool.render_many("pool proj", [f"scene {i}" for i in range(6)], targets=targets, register=False)
+    )
+
+    assert all(t.exists() for t in targets)
+    saves = [
+        sum(n["class_type"] == "SaveImage" for job in q for n in job.values()) for q in queues
+    ]
+    assert sum(saves) == 6 and saves[2] == 0 and min(saves[:2]) >= 2  # batches of 2
+    assert {r.meta["backend"] for r in results} == {"http://n0", "http://n1"}
+    assert max(r.meta["attempts"] for r in results) == 2
+    stats = {s["url"]: s for s in pool.stats()}
+    assert stats["http://n2"]["healthy"] is False and stats["http://n0"]["outstanding"] == 0
+
+
+def test_adapter_registry_lazy_singletons_and_plugins():
+    from echo_os.adapters.render import BaseRenderAdapter, Capabilities, get_adapter, register_adapter
+
+    created = []
+
+    class Probe(BaseRenderAdapter):
+        name = "probe"
+        capabilities = Capabilities(batch=True, max_concurrency=7)
+
+        def __init__(self):
+            created.append(self)
+
+        async def is_available(self):
+            return False
+
+    register_adapter("probe", Probe)
+    assert created == []  # lazily created
+    assert get_adapter("probe") is get_adapter("probe") and len(created) == 1
+
+    c = TestClient(app)
+    info = c.get("/api/adapters/probe").json()
+    assert info["available"] is False and info["capabilities"]["max_concurrency"] == 7
+    names = {a["name"] for a in c.get("/api/adapters").json()["items"]}
+    assert {"dummy", "dalle", "comfyui", "comfy-pool", "probe"} <= names
+    assert get_adapter("dalle").quality == "standard"
+    assert c.post("/api/render", json={"project": "p", "prompt": "x", "adapter": "nope"}).status_code == 400
+    assert c.get("/api/adapters/nope").status_code == 404
+
+
+def test_render_many_fallback_and_render_endpoint(tmp_path):
+    from echo_os.adapters.render import BaseRenderAdapter, Capabilities, RenderResult
+
+    running, peak = [0], [0]
+
+    class Slow(BaseRenderAdapter):
+        capabilities = Capabilities(max_concurrency=2)
+
+        async def render(self, project, prompt, **kwargs):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            if prompt == "bad":
+                raise RuntimeError("boom")
+            return RenderResult(path=kwargs["target"], meta={})
+
+    out = asyncio.run(
+        Slow().render_many(
+            "p", ["a", "bad", "c", "d"], targets=list("wxyz"), return_exceptions=True
+        )
+    )
+    assert [getattr(r, "path", None) for r in out] == ["w", None, "y", "z"]
+    assert isinstance(out[1], RuntimeError) and peak[0] == 2
+
+    c = TestClient(app)
+    body = c.post("/api/render", json={"project": "batch", "prompts": ["x", "y", "z"]}).json()
+    assert len(body["paths"]) == 3 and len(set(body["paths"])) == 3